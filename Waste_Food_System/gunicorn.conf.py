@@ -0,0 +1,50 @@
+"""
+Production launcher config.
+
+    gunicorn -c Waste_Food_System/gunicorn.conf.py
+
+Settings, templates aur ML models master process me ek baar load hote hain
+(preload_app), phir workers fork hote hain aur unhe copy-on-write share
+karte hain. Har worker traffic lene se pehle warmup karta hai (core/warmup.py).
+Env vars: PORT, WEB_CONCURRENCY, GUNICORN_THREADS, GUNICORN_TIMEOUT,
+GUNICORN_PRELOAD.
+"""
+import multiprocessing
+import os
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Waste_Food_System.settings")
+
+wsgi_app = "Waste_Food_System.wsgi:application"
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, 8)))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+# GUNICORN_PRELOAD=0 sirf comparison ke liye (measure_startup.py --no-preload)
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+# Workers ko kabhi kabhi recycle karo taaki memory dheere dheere na badhe
+max_requests = 2000
+max_requests_jitter = 200
+accesslog = "-"
+
+
+def when_ready(server):
+    # preload_app ki wajah se Django yahan tak setup ho chuka hai, fork abhi baaki
+    if not server.cfg.preload_app:
+        return
+    from core.warmup import preload
+
+    preload()
+    server.log.info("Preloaded templates and ML models in master")
+
+
+def post_worker_init(worker):
+    # Fork ke baad, app load hone ke baad, pehli request se pehle
+    from core.warmup import warmup
+
+    try:
+        warmup()
+    except Exception:
+        # Worker chalta rahe; /ready/ 503 dega aur agli check pe dobara try karega
+        worker.log.exception("Warmup failed in worker %s", worker.pid)
+    else:
+        worker.log.info("Worker %s warm", worker.pid)
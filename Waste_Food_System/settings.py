@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,7 +44,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.QueryCountMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticAssetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -61,13 +64,20 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Templates ek baar compile hokar process me cache (DEBUG me file
+            # badalne par autoreloader cache reset kar deta hai)
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -78,11 +88,53 @@ WSGI_APPLICATION = 'Waste_Food_System.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Default SQLite. DB_ENGINE=postgres set karne par Postgres (POSTGRES_* env vars).
+DB_ENGINE = os.environ.get("DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgres":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get("POSTGRES_DB", "foodwise"),
+            'USER': os.environ.get("POSTGRES_USER", "foodwise"),
+            'PASSWORD': os.environ.get("POSTGRES_PASSWORD", ""),
+            'HOST': os.environ.get("POSTGRES_HOST", "localhost"),
+            'PORT': os.environ.get("POSTGRES_PORT", "5432"),
+            # Har request pe naya connection nahi; tuta hua connection reuse se pehle check
+            'CONN_MAX_AGE': int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    # DB_POOL_MAX_SIZE set ho to psycopg 3 connection pool (CONN_MAX_AGE tab 0 hona chahiye)
+    if os.environ.get("DB_POOL_MAX_SIZE"):
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+            'max_size': int(os.environ.get("DB_POOL_MAX_SIZE")),
+            'timeout': 10,
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                # Write transaction shuru hote hi write lock, taaki beech me
+                # read -> write upgrade par turant "database is locked" na aaye
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
     }
+
+# Har naye SQLite connection par lagne wale PRAGMAs (core/db.py)
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",       # readers writers ko block nahi karte
+    "synchronous": "NORMAL",     # WAL ke saath safe, har commit pe fsync nahi
+    "busy_timeout": 20000,       # ms, lock mile tak wait (error ke bajaye)
+    "mmap_size": 134217728,      # 128 MB
+    "cache_size": -20000,        # ~20 MB page cache
+    "temp_store": "MEMORY",
 }
 
 
@@ -125,6 +177,117 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
+# `python manage.py collectstatic` yahan hashed + .gz/.br files likhta hai
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "core.storage.CompressedManifestStaticFilesStorage"},
+}
+
+# Default per-process memory cache. Multiple workers ke liye REDIS_URL set karein,
+# taaki template fragments aur rate limits sab workers share karein.
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+# X-Query-Count response header (core/middleware.py), dev me on
+QUERY_COUNT_HEADER = DEBUG
+
+# Shared cache (REDIS_URL) par session cache se padha jata hai (DB sirf
+# cache miss / write par) aur User object bhi cache me (core/auth.py), User
+# save hote hi invalidate. Per-process LocMem par dono off: ek worker ka
+# logout / invalidation baaki workers tak nahi pahunchta. USER_CACHE = True /
+# False se user cache force kar sakte hain.
+USER_CACHE = None
+SESSION_ENGINE = (
+    "django.contrib.sessions.backends.cached_db"
+    if CACHES["default"]["BACKEND"] not in (
+        "django.core.cache.backends.locmem.LocMemCache",
+        "django.core.cache.backends.dummy.DummyCache",
+    )
+    else "django.contrib.sessions.backends.db"
+)
+AUTHENTICATION_BACKENDS = [
+    "core.auth.CachedModelBackend",
+    # Purane logins (is backend ke naam se bani sessions) chalte rahein
+    "django.contrib.auth.backends.ModelBackend",
+]
+
 LOGIN_REDIRECT_URL = "/dashboard/"
 LOGOUT_REDIRECT_URL = "home"
-LOGIN_URL = "/login/"
\ No newline at end of file
+LOGIN_URL = "/login/"
+
+# Quantity units -> plates conversion (see core/quantity.py).
+# Kitchen ke portion size ke hisaab se adjust karein.
+QTY_UNIT_FACTORS = {
+    "kg": 4.0,
+    "g": 0.004,
+    "litre": 4.0,
+    "ml": 0.004,
+}
+
+
+# Data retention (core/retention.py): isse purani daily rows monthly
+# rollups me fold hokar ARCHIVE_DIR me gzip CSV ban jati hain.
+RETENTION_DAYS = 730
+ARCHIVE_DIR = BASE_DIR / "archive"
+
+
+# Background tasks (core/tasks.py). Worker: `python manage.py run_worker`
+# TASKS_RUN_INLINE=True karne par jobs bina worker ke request process me chalte hain.
+TASKS_RUN_INLINE = False
+TASK_MAX_ATTEMPTS = 5
+TASK_RETRY_BASE_SECONDS = 10
+TASK_LEASE_SECONDS = 300
+
+
+# Request accept / reject par requester ko message (core/notifications.py).
+# Default LocalTransport kuch bahar nahi bhejta; SMS gateway / relay ke liye
+# NOTIFY_TRANSPORT=core.notifications.WebhookTransport aur NOTIFY_WEBHOOK_URL.
+NOTIFY_TRANSPORT = os.environ.get("NOTIFY_TRANSPORT", "core.notifications.LocalTransport")
+NOTIFY_WEBHOOK_URL = os.environ.get("NOTIFY_WEBHOOK_URL", "")
+NOTIFY_WEBHOOK_TOKEN = os.environ.get("NOTIFY_WEBHOOK_TOKEN", "")
+NOTIFY_WEBHOOK_TIMEOUT = 10
+# Ek provider call me kitne messages
+NOTIFY_BATCH_SIZE = 100
+NOTIFY_MAX_ATTEMPTS = 5
+NOTIFY_RETRY_BASE_SECONDS = 30
+NOTIFY_LEASE_SECONDS = 120
+# Itne din se purane sent / superseded / failed messages run_worker delete karta hai
+NOTIFY_RETENTION_DAYS = 30
+
+
+# Prediction drift monitoring (core/monitoring.py), /metrics par expose.
+# Error = predicted - sold (plates); EWMA bias threshold cross ho to retrain job.
+MODEL_DRIFT_EWMA_ALPHA = 0.2
+MODEL_DRIFT_THRESHOLD = 5.0
+MODEL_DRIFT_MIN_SAMPLES = 7
+MODEL_RETRAIN_COOLDOWN_SECONDS = 60 * 60 * 24
+# Bahut saare restaurants ho to False: sirf per-dish aggregate series
+MODEL_METRICS_PER_RESTAURANT = True
+# Set ho to /metrics par "Authorization: Bearer <token>" chahiye. Token na ho
+# to sirf logged-in staff, aur in IPs ko /metrics milta hai. Default khali:
+# same host par reverse proxy ho to har client 127.0.0.1 dikhta hai, isliye
+# loopback yahan tabhi daalein jab gunicorn seedha expose ho.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_ALLOWED_IPS = []
+
+
+# Public request_food form ka rate limit (core/ratelimit.py): (requests, seconds).
+# Counters default cache me rehte hain; multiple workers ke liye shared
+# cache (Redis / Memcached) configure karein.
+REQUEST_FOOD_RATE_LIMITS = {
+    "ip": (10, 60),
+    "phone": (3, 600),
+}
+# Sirf tab True karein jab app trusted reverse proxy ke peeche ho
+RATELIMIT_TRUST_X_FORWARDED_FOR = False
+REQUEST_FOOD_DEDUPE_LOCK_SECONDS = 10
@@ -2,15 +2,192 @@
 from .models import FoodWaste
 
 admin.site.register(FoodWaste)"""
-from django.contrib import admin
-from .models import FoodEntry,CloseDayEntry
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .analytics import DISHES, invalidate_rollups, invalidate_rollups_for
+from .models import (
+    FoodEntry, CloseDayEntry, FoodRequest, Task, Organization, RestaurantProfile, Notification,
+)
+from .notifications import notify_status_change
+from .tasks import enqueue_once
+
+# Isse badi (unfiltered) table par exact COUNT(*) ki jagah estimate
+ESTIMATED_COUNT_THRESHOLD = 100000
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Postgres par bina filter wali changelist ka count pg_class.reltuples
+    se (ANALYZE ka estimate), taaki millions rows par COUNT(*) scan na ho.
+    Filter laga ho ya table chhoti ho to exact count.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if connection.vendor == "postgresql" and query is not None and not query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [self.object_list.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= ESTIMATED_COUNT_THRESHOLD:
+                return row[0]
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Badi tables ke liye common settings: estimated count, "x of y" wala
+    doosra COUNT nahi, aur user ka dropdown nahi (raw id).
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+class DishTotalsMixin:
+    """
+    Changelist ke upar filtered rows ka total (ek aggregate query). Sirf
+    jab filter / search / date drill-down laga ho: bina filter poori table
+    ka SUM har page load par nahi.
+    """
+    change_list_template = "admin/core/change_list_totals.html"
+    total_fields = ()
+
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        changelist = getattr(response, "context_data", {}).get("cl")
+        if changelist is not None and changelist.queryset.query.where:
+            totals = changelist.queryset.aggregate(
+                **{field: Sum(field) for field in self.total_fields}
+            )
+            response.context_data["totals"] = {
+                field.replace("_qty", "").replace("_", " "): round(value or 0, 2)
+                for field, value in totals.items()
+            }
+        return response
+
+
+class RollupInvalidatingMixin:
+    """
+    Purane mahine ki entries delete hon to unke rollups bhi (set-wise; model
+    par post_delete receiver nahi hai taaki bulk delete fast rahe).
+    """
+
+    def delete_model(self, request, obj):
+        invalidate_rollups(obj.user_id, [obj.date])
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        invalidate_rollups_for(queryset)
+        super().delete_queryset(request, queryset)
+
 
 @admin.register(FoodEntry)
-class FoodEntryAdmin(admin.ModelAdmin):
+class FoodEntryAdmin(RollupInvalidatingMixin, DishTotalsMixin, LargeTableAdmin):
     list_display = ('user', 'date', 'dal', 'chawal', 'sabji')
+    list_select_related = ('user',)
+    date_hierarchy = 'date'
+    raw_id_fields = ('user',)
+    # Exact username: auth_user ke unique index se
+    search_fields = ('=user__username',)
+    total_fields = tuple(f"{dish}_qty" for dish in DISHES)
+
 
 @admin.register(CloseDayEntry)
-class CloseDayEntry(admin.ModelAdmin):
+class CloseDayEntryAdmin(RollupInvalidatingMixin, DishTotalsMixin, LargeTableAdmin):
     list_display = ('user', 'date',
                      'sold_dal', 'sold_chawal', 'sold_sabji')
+    list_select_related = ('user',)
+    date_hierarchy = 'date'
+    raw_id_fields = ('user',)
+    search_fields = ('=user__username',)
+    total_fields = tuple(f"sold_{dish}_qty" for dish in DISHES) + tuple(
+        f"{dish}_waste_qty" for dish in DISHES
+    )
+
+
+def _set_request_status(modeladmin, request, queryset, status):
+    """
+    Ek UPDATE; jinka status sach me badla unko notification (background).
+    """
+    flipped = list(
+        queryset.exclude(status=status).select_related("restaurant")
+        .only("id", "requester_phone", "restaurant__username")
+    )
+    updated = queryset.update(status=status, updated_at=timezone.now())
+    for req in flipped:
+        req.status = status
+    notify_status_change(flipped)
+    modeladmin.message_user(request, f"{updated} request(s) marked {status}.", messages.SUCCESS)
+
+
+@admin.register(FoodRequest)
+class FoodRequestAdmin(LargeTableAdmin):
+    list_display = ('id', 'restaurant', 'requester_name', 'requester_phone', 'status', 'created_at')
+    list_select_related = ('restaurant',)
+    list_filter = ('status',)
+    date_hierarchy = 'created_at'
+    raw_id_fields = ('restaurant',)
+    search_fields = ('=restaurant__username', '=requester_phone')
+    actions = ('mark_accepted', 'mark_rejected')
+
+    @admin.action(description="Mark selected requests as accepted")
+    def mark_accepted(self, request, queryset):
+        _set_request_status(self, request, queryset, "accepted")
+
+    @admin.action(description="Mark selected requests as rejected")
+    def mark_rejected(self, request, queryset):
+        _set_request_status(self, request, queryset, "rejected")
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_after', 'updated_at')
+    list_filter = ('status', 'name')
+    actions = ('retry',)
+
+    @admin.action(description="Retry selected tasks now")
+    def retry(self, request, queryset):
+        updated = queryset.exclude(status="running").update(
+            status="pending", attempts=0, run_after=timezone.now(), locked_until=None
+        )
+        self.message_user(request, f"{updated} task(s) queued again.", messages.SUCCESS)
+
+
+@admin.register(Notification)
+class NotificationAdmin(LargeTableAdmin):
+    list_display = ('phone', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    raw_id_fields = ('request',)
+    search_fields = ('=phone',)
+    actions = ('retry',)
+
+    @admin.action(description="Retry selected notifications now")
+    def retry(self, request, queryset):
+        updated = queryset.filter(status="failed").update(
+            status="pending", attempts=0, next_attempt_at=timezone.now()
+        )
+        if updated:
+            enqueue_once("dispatch_notifications")
+        self.message_user(request, f"{updated} notification(s) queued again.", messages.SUCCESS)
+
+
+@admin.register(Organization)
+class OrganizationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'owner', 'created_at')
+    filter_horizontal = ('outlets',)
+
 
+@admin.register(RestaurantProfile)
+class RestaurantProfileAdmin(admin.ModelAdmin):
+    list_display = ('user', 'display_name', 'area')
+    search_fields = ('user__username', 'display_name', 'area')
+    list_select_related = ('user',)
@@ -0,0 +1,303 @@
+"""
+Waste analytics.
+
+Saari aggregation database me GROUP BY se hoti hai, (user, date) index
+ke upar. Band mahino ke liye WasteRollup table precomputed cache ka kaam
+karta hai, isliye multi-year charts sirf kuch sau rollup rows padhte hain.
+"""
+import calendar
+from datetime import date, timedelta
+
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import ExtractWeekDay, TruncMonth, TruncWeek
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils.timezone import now
+
+from .models import FoodEntry, CloseDayEntry, WasteRollup
+
+DISHES = ("dal", "chawal", "sabji")
+PERIODS = {"week": TruncWeek, "month": TruncMonth}
+
+# Default window agar start na diya ho
+DEFAULT_WEEKS = 12
+
+PLANNED_SUMS = {f"{dish}_planned": Sum(f"{dish}_qty") for dish in DISHES}
+CLOSED_SUMS = {
+    **{f"{dish}_sold": Sum(f"sold_{dish}_qty") for dish in DISHES},
+    **{f"{dish}_waste": Sum(f"{dish}_waste_qty") for dish in DISHES},
+}
+ROLLUP_SUMS = {
+    "planned_days": Sum("planned_days"),
+    "closed_days": Sum("closed_days"),
+    **{name: Sum(name) for name in list(PLANNED_SUMS) + list(CLOSED_SUMS)},
+}
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def python_weekday(extract_value):
+    # ExtractWeekDay: 1 = Sunday ... 7 = Saturday  ->  0 = Monday
+    return (extract_value + 5) % 7
+
+
+def latest_per_day(model, user=None, start=None, end=None, users=None):
+    """
+    Ek din me multiple entries ho sakti hain; get_latest_entry ki tarah
+    sirf latest (max id) wali count hoti hai. Sab kuch ek subquery me.
+    user=None -> saare restaurants (ya `users` list ke restaurants).
+    """
+    filters = {"user": user} if user is not None else {}
+    if users is not None:
+        filters["user__in"] = users
+    if start:
+        filters["date__gte"] = start
+    if end:
+        filters["date__lte"] = end
+
+    latest_ids = (
+        model.objects.filter(**filters)
+        .values("user", "date")
+        .annotate(latest=Max("id"))
+        .values("latest")
+    )
+    return model.objects.filter(id__in=latest_ids)
+
+
+def grouped_totals(user, start, end, **group_by):
+    """
+    Planned aur closed dono tables ko same keys pe group karke
+    {key: {planned_days, closed_days, <dish>_planned, ...}} deta hai.
+    """
+    keys = list(group_by)
+    merged = {}
+
+    planned = (
+        latest_per_day(FoodEntry, user, start, end)
+        .annotate(**group_by).values(*keys)
+        .annotate(planned_days=Count("id"), **PLANNED_SUMS)
+        .order_by()
+    )
+    closed = (
+        latest_per_day(CloseDayEntry, user, start, end)
+        .annotate(**group_by).values(*keys)
+        .annotate(closed_days=Count("id"), **CLOSED_SUMS)
+        .order_by()
+    )
+
+    for row in list(planned) + list(closed):
+        key = tuple(row.pop(k) for k in keys)
+        merged.setdefault(key, {}).update(row)
+    return merged
+
+
+def _totals(row):
+    """
+    Bucket row ko API shape me: dish-wise planned / sold / waste / waste_rate.
+    """
+    dishes = {}
+    for dish in DISHES:
+        planned = row.get(f"{dish}_planned") or 0
+        waste = row.get(f"{dish}_waste") or 0
+        dishes[dish] = {
+            "planned": round(planned, 2),
+            "sold": round(row.get(f"{dish}_sold") or 0, 2),
+            "waste": round(waste, 2),
+            "waste_rate": round(waste / planned, 4) if planned else None,
+        }
+    return {
+        "planned_days": row.get("planned_days") or 0,
+        "closed_days": row.get("closed_days") or 0,
+        "dishes": dishes,
+    }
+
+
+# ================================
+# Rollups (closed months)
+# ================================
+def ensure_rollups(user, before=None):
+    """
+    `before` (default: current month) se pehle ke jin mahino ka rollup
+    nahi bana, unhe ek grouped query me compute karke store karta hai.
+    """
+    before = month_start(before or now().date())
+
+    first_days = [
+        model.objects.filter(user=user, date__lt=before).aggregate(first=Min("date"))["first"]
+        for model in (FoodEntry, CloseDayEntry)
+    ]
+    first_days = [d for d in first_days if d]
+    if not first_days:
+        return
+
+    have = set(
+        WasteRollup.objects.filter(user=user, month__lt=before)
+        .values_list("month", flat=True).distinct()
+    )
+
+    missing, month = [], month_start(min(first_days))
+    while month < before:
+        if month not in have:
+            missing.append(month)
+        month = (month + timedelta(days=32)).replace(day=1)
+    if not missing:
+        return
+
+    grouped = grouped_totals(
+        user, missing[0], before - timedelta(days=1),
+        month=TruncMonth("date"), weekday=ExtractWeekDay("date"),
+    )
+    rollups = [
+        WasteRollup(
+            user=user,
+            month=month,
+            day_of_week=python_weekday(weekday),
+            **{k: v or 0 for k, v in row.items()},
+        )
+        for (month, weekday), row in grouped.items()
+        if month in missing
+    ]
+    # Khali mahino ka zero row, taaki unhe har baar dobara scan na karna pade
+    filled = {rollup.month for rollup in rollups}
+    rollups += [
+        WasteRollup(user=user, month=month, day_of_week=0)
+        for month in missing if month not in filled
+    ]
+    WasteRollup.objects.bulk_create(rollups, ignore_conflicts=True)
+
+
+def invalidate_rollups(user, dates):
+    """
+    Purane mahino ka data badle (import etc.) to unke rollups hata do,
+    agli analytics request pe dobara ban jayenge.
+    Archived rollups nahi hatte: unka raw data ab hot tables me nahi hai,
+    naya data agle archive run me unme jud jata hai.
+    """
+    months = {month_start(d) for d in dates}
+    if months:
+        WasteRollup.objects.filter(
+            user=user, month__in=months, archived=False
+        ).delete()
+
+
+def invalidate_rollups_for(queryset):
+    """
+    Entries ka queryset delete karne se pehle: jin band mahino ko ye rows
+    chhoti hain unke rollups hata do, har user ke liye ek DELETE.
+    """
+    months_by_user = {}
+    pairs = (
+        queryset.filter(date__lt=month_start(now().date()))
+        .annotate(month=TruncMonth("date")).order_by()
+        .values_list("user_id", "month").distinct()
+    )
+    for user_id, month in pairs:
+        months_by_user.setdefault(user_id, set()).add(month)
+    for user_id, months in months_by_user.items():
+        invalidate_rollups(user_id, months)
+
+
+@receiver(post_save, sender=FoodEntry)
+@receiver(post_save, sender=CloseDayEntry)
+def _entry_changed(sender, instance, **kwargs):
+    # Admin / shell se purane mahine ki entry badli to rollup stale na rahe.
+    # Current month rollup me hota hi nahi. bulk_create / update() / delete
+    # par yahan kuch nahi hota (post_delete receiver fast delete band kar
+    # deta): wahan caller khud invalidate_rollups(_for) bulaye (imports.py,
+    # admin).
+    day = instance.date
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    if month_start(day) < month_start(now().date()):
+        invalidate_rollups(instance.user_id, [day])
+
+
+# ================================
+# Public API
+# ================================
+def waste_trend(user, period="week", start=None, end=None):
+    """
+    Week / month buckets ka trend, purane se naya.
+    Month trend band mahino ke liye rollups + current month live padhta hai.
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period '{period}'")
+
+    today = now().date()
+    end = end or today
+    if start is None:
+        if period == "week":
+            start = end - timedelta(weeks=DEFAULT_WEEKS)
+        else:
+            start = month_start(end).replace(year=end.year - 1)
+
+    if period == "week":
+        grouped = grouped_totals(user, start, end, bucket=TruncWeek("date"))
+        buckets = {key[0]: row for key, row in grouped.items()}
+    else:
+        current = month_start(today)
+        ensure_rollups(user, current)
+        rollups = (
+            WasteRollup.objects.filter(
+                user=user, month__gte=month_start(start), month__lte=min(end, current)
+            )
+            .values("month").annotate(**ROLLUP_SUMS).order_by()
+        )
+        buckets = {row.pop("month"): row for row in rollups}
+        if end >= current:
+            live = grouped_totals(user, current, end, bucket=TruncMonth("date"))
+            buckets.update({key[0]: row for key, row in live.items()})
+
+    return [
+        {"period": bucket.isoformat(), **_totals(buckets[bucket])}
+        for bucket in sorted(buckets)
+    ]
+
+
+def weekday_pattern(user, start=None, end=None):
+    """
+    Monday..Sunday ka average waste per closed day.
+    """
+    today = now().date()
+    current = month_start(today)
+    ensure_rollups(user, current)
+
+    rollup_filters = {"user": user, "month__lt": current}
+    if start:
+        rollup_filters["month__gte"] = month_start(start)
+    if end:
+        rollup_filters["month__lte"] = end
+
+    totals = {}
+    rollups = (
+        WasteRollup.objects.filter(**rollup_filters)
+        .values("day_of_week").annotate(**ROLLUP_SUMS).order_by()
+    )
+    for row in rollups:
+        totals[row.pop("day_of_week")] = row
+
+    if end is None or end >= current:
+        live = grouped_totals(user, current, end or today, weekday=ExtractWeekDay("date"))
+        for (weekday,), row in live.items():
+            bucket = totals.setdefault(python_weekday(weekday), {})
+            for key, value in row.items():
+                bucket[key] = (bucket.get(key) or 0) + (value or 0)
+
+    pattern = []
+    for weekday in range(7):
+        row = _totals(totals.get(weekday, {}))
+        days = row["closed_days"] or 1
+        for values in row["dishes"].values():
+            values["avg_waste"] = round(values["waste"] / days, 2)
+        pattern.append({"day": calendar.day_name[weekday], **row})
+    return pattern
+
+
+def analytics_summary(user, period="week", start=None, end=None):
+    return {
+        "period": period,
+        "trend": waste_trend(user, period, start, end),
+        "weekday": weekday_pattern(user, start, end),
+    }
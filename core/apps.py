@@ -3,3 +3,18 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        # Background jobs register karo (core/tasks.py registry)
+        from . import jobs  # noqa: F401
+        # User cache invalidation signals (core/auth.py)
+        from . import auth  # noqa: F401
+        # Search index sync signals (core/search.py)
+        from . import search  # noqa: F401
+        # Purane mahine ki entry badle to rollup invalidate (core/analytics.py)
+        from . import analytics  # noqa: F401
+        # Request status notifications (core/notifications.py)
+        from . import notifications  # noqa: F401
+        from .db import connect_signals
+
+        connect_signals()
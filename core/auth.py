@@ -0,0 +1,67 @@
+"""
+Cached auth backend.
+
+Har authenticated request par AuthenticationMiddleware session se user id
+lekar User fetch karta hai. Ye backend wo User object cache me rakhta hai;
+User save / delete hote hi (password change, last_login, is_active...)
+cache entry hata di jati hai, isliye purana object serve nahi hota.
+
+Caching sirf shared cache (Redis / Memcached / DB) par chalti hai: per-process
+LocMem me ek worker ka invalidation baaki workers tak nahi pahunchta, aur
+wahan password change / deactivate ke baad bhi purana User chalta rehta.
+QuerySet.update() signal nahi bhejta; User rows aise badlein to
+forget_users(ids) call karein.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+USER_CACHE_SECONDS = 60
+
+# Ye backends process ke bahar share nahi hote
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def user_cache_enabled():
+    """
+    settings.USER_CACHE True / False, ya None (default): sirf shared cache par.
+    """
+    enabled = getattr(settings, "USER_CACHE", None)
+    if enabled is not None:
+        return enabled
+    return settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHES
+
+
+class CachedModelBackend(ModelBackend):
+
+    def get_user(self, user_id):
+        if not user_cache_enabled():
+            return super().get_user(user_id)
+
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, USER_CACHE_SECONDS)
+        return user
+
+
+def forget_users(user_ids):
+    cache.delete_many([user_cache_key(user_id) for user_id in user_ids])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    cache.delete(user_cache_key(instance.pk))
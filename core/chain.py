@@ -0,0 +1,122 @@
+"""
+Multi-outlet chain dashboard.
+
+Ek Organization ke saare outlets ka aaj ka planned / sold / waste aur
+pending requests, outlets ki ginti se independent, fixed number of queries
+me: outlets, planned, closed, pending counts (4). Kal ka forecast bhi
+saare outlets ke liye ek saath (har dish ka ek predict() call).
+"""
+from django.db.models import Count
+from django.utils.timezone import now
+
+from .analytics import DISHES, latest_per_day, waste_trend
+from .ml import predict_next_day
+from .models import FoodEntry, CloseDayEntry, FoodRequest
+
+PLANNED_QTY = [f"{dish}_qty" for dish in DISHES]
+CLOSED_QTY = [f"sold_{dish}_qty" for dish in DISHES] + [f"{dish}_waste_qty" for dish in DISHES]
+
+# Drill-down page par kitni recent requests
+OUTLET_RECENT_REQUESTS = 20
+
+
+def _empty_dishes():
+    return {dish: {"planned": 0, "sold": 0, "waste": 0} for dish in DISHES}
+
+
+def chain_summary(org, day=None, outlets=None):
+    """
+    {date, outlets: [per-outlet row], totals}. `outlets` do to sirf unka
+    (drill-down); warna organization ke saare outlets.
+    """
+    day = day or now().date()
+    if outlets is None:
+        outlets = list(org.outlets.order_by("username").values_list("id", "username"))
+    ids = [outlet_id for outlet_id, _ in outlets]
+
+    planned = {
+        row.pop("user_id"): row
+        for row in latest_per_day(FoodEntry, users=ids, start=day, end=day)
+        .values("user_id", *PLANNED_QTY)
+    }
+    closed = {
+        row.pop("user_id"): row
+        for row in latest_per_day(CloseDayEntry, users=ids, start=day, end=day)
+        .values("user_id", *CLOSED_QTY)
+    }
+    pending = dict(
+        FoodRequest.objects.filter(restaurant_id__in=ids, status="pending")
+        .values("restaurant_id").annotate(count=Count("id"))
+        .values_list("restaurant_id", "count").order_by()
+    )
+
+    rows, features = [], []
+    totals = {"dishes": _empty_dishes(), "pending_requests": 0, "planned_outlets": 0, "closed_outlets": 0}
+
+    for outlet_id, username in outlets:
+        dishes = _empty_dishes()
+        p, c = planned.get(outlet_id), closed.get(outlet_id)
+        for dish in DISHES:
+            if p:
+                dishes[dish]["planned"] = p[f"{dish}_qty"]
+            if c:
+                dishes[dish]["sold"] = c[f"sold_{dish}_qty"]
+                dishes[dish]["waste"] = c[f"{dish}_waste_qty"]
+            for key, value in dishes[dish].items():
+                totals["dishes"][dish][key] += value
+
+        row = {
+            "id": outlet_id,
+            "username": username,
+            "planned": p is not None,
+            "closed": c is not None,
+            "dishes": dishes,
+            "pending_requests": pending.get(outlet_id, 0),
+            "has_forecast": False,
+        }
+        totals["planned_outlets"] += row["planned"]
+        totals["closed_outlets"] += row["closed"]
+        totals["pending_requests"] += row["pending_requests"]
+
+        if p and c:
+            features.append({
+                "day_of_week": day.weekday(),
+                **{f"{dish}_added": p[f"{dish}_qty"] for dish in DISHES},
+                **{f"{dish}_sold": c[f"sold_{dish}_qty"] for dish in DISHES},
+                **{f"{dish}_waste": c[f"{dish}_waste_qty"] for dish in DISHES},
+            })
+            row["_forecast_index"] = len(features) - 1
+        rows.append(row)
+
+    forecasts = predict_next_day(features)
+    for row in rows:
+        index = row.pop("_forecast_index", None)
+        for dish in DISHES:
+            row["dishes"][dish]["forecast"] = forecasts[index][dish] if index is not None else None
+        row["has_forecast"] = index is not None
+
+    return {
+        "date": day.isoformat(),
+        "organization": {"id": org.id, "name": org.name},
+        "outlets": rows,
+        "totals": totals,
+    }
+
+
+def outlet_detail(org, outlet, day=None):
+    """
+    Ek outlet ka drill-down: aaj ki row, weekly waste trend, recent requests.
+    """
+    summary = chain_summary(org, day, outlets=[(outlet.id, outlet.username)])
+    requests = (
+        FoodRequest.objects.filter(restaurant=outlet)
+        .order_by("-created_at")
+        .values("id", "requester_name", "requester_phone", "status", "created_at")
+        [:OUTLET_RECENT_REQUESTS]
+    )
+    return {
+        **summary["outlets"][0],
+        "date": summary["date"],
+        "trend": waste_trend(outlet, "week"),
+        "requests": list(requests),
+    }
@@ -0,0 +1,21 @@
+"""
+Database connection tuning.
+
+SQLite: har naye connection par settings.SQLITE_PRAGMAS (WAL,
+synchronous=NORMAL, busy timeout, mmap). Postgres ke liye persistent
+connections / pool settings.py me DB_ENGINE se chalte hain.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name, value in getattr(settings, "SQLITE_PRAGMAS", {}).items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def connect_signals():
+    connection_created.connect(apply_sqlite_pragmas, dispatch_uid="core.db.sqlite_pragmas")
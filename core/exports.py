@@ -0,0 +1,191 @@
+"""
+History export helpers.
+
+FoodEntry / CloseDayEntry / FoodRequest ki history ko chunks me stream
+karta hai, taaki multi-year export bhi constant memory me chale aur
+pehla byte turant nikal jaye.
+"""
+import csv
+import io
+from itertools import islice
+
+from .models import FoodEntry, CloseDayEntry, FoodRequest
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export optional hai
+    pa = pq = None
+
+
+# Ek DB round trip me kitni rows aayengi (server-side cursor chunk)
+EXPORT_CHUNK_SIZE = 2000
+
+# kind -> (model, owner field, date lookup, [(column, lookup, type)])
+EXPORTS = {
+    "planned": (FoodEntry, "user", "date", [
+        ("restaurant", "user__username", "string"),
+        ("date", "date", "date"),
+        ("dal", "dal", "string"),
+        ("chawal", "chawal", "string"),
+        ("sabji", "sabji", "string"),
+    ]),
+    "closed": (CloseDayEntry, "user", "date", [
+        ("restaurant", "user__username", "string"),
+        ("date", "date", "date"),
+        ("sold_dal", "sold_dal", "string"),
+        ("sold_chawal", "sold_chawal", "string"),
+        ("sold_sabji", "sold_sabji", "string"),
+        ("dal_waste", "dal_waste", "string"),
+        ("chawal_waste", "chawal_waste", "string"),
+        ("sabji_waste", "sabji_waste", "string"),
+    ]),
+    "requests": (FoodRequest, "restaurant", "created_at__date", [
+        ("restaurant", "restaurant__username", "string"),
+        ("created_at", "created_at", "timestamp"),
+        ("requester_name", "requester_name", "string"),
+        ("requester_phone", "requester_phone", "string"),
+        ("status", "status", "string"),
+    ]),
+}
+
+EXPORT_FORMATS = ("csv", "parquet")
+
+
+class ExportError(ValueError):
+    pass
+
+
+def export_columns(kind):
+    return [name for name, _, _ in EXPORTS[kind][3]]
+
+
+def iter_export_rows(kind, start=None, end=None, user=None):
+    """
+    Given range ki rows tuples me deta hai.
+    .iterator() ki wajah se poora queryset kabhi memory me nahi aata.
+    """
+    if kind not in EXPORTS:
+        raise ExportError(f"Unknown export '{kind}'")
+
+    model, owner_field, date_lookup, columns = EXPORTS[kind]
+    qs = model.objects.all()
+
+    if user is not None:
+        qs = qs.filter(**{owner_field: user})
+    if start:
+        qs = qs.filter(**{f"{date_lookup}__gte": start})
+    if end:
+        qs = qs.filter(**{f"{date_lookup}__lte": end})
+
+    order_field = date_lookup.split("__")[0]
+    lookups = [lookup for _, lookup, _ in columns]
+    return qs.order_by(order_field, "id").values_list(*lookups).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+
+
+def stream_csv(kind, rows):
+    """
+    CSV ko EXPORT_CHUNK_SIZE rows ke text chunks me yield karta hai.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(export_columns(kind))
+
+    while True:
+        batch = list(islice(rows, EXPORT_CHUNK_SIZE))
+        if batch:
+            writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        if len(batch) < EXPORT_CHUNK_SIZE:
+            return
+
+
+class _ParquetSink:
+    """
+    Write-only file object jo likhe hue bytes ko hold karta hai
+    jab tak unhe drain() karke response me na bhej diya jaye.
+    """
+
+    closed = False
+
+    def __init__(self):
+        self._chunks = []
+        self._pos = 0
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+def _parquet_schema(kind):
+    types = {
+        "string": pa.string(),
+        "date": pa.date32(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[col_type]) for name, _, col_type in EXPORTS[kind][3]])
+
+
+def stream_parquet(kind, rows):
+    """
+    Har chunk ek Parquet row group banta hai aur likhte hi yield hota hai.
+    """
+    if pa is None:
+        raise ExportError("Parquet export ke liye pyarrow install karein")
+
+    schema = _parquet_schema(kind)
+    names = schema.names
+    sink = _ParquetSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+
+    try:
+        while True:
+            batch = list(islice(rows, EXPORT_CHUNK_SIZE))
+            if batch:
+                columns = list(zip(*batch))
+                # CharField waste columns me purani int values bhi ho sakti hain
+                data = {
+                    name: [None if v is None else str(v) for v in col]
+                    if schema.field(name).type == pa.string() else list(col)
+                    for name, col in zip(names, columns)
+                }
+                writer.write_table(pa.table(data, schema=schema))
+                yield sink.drain()
+            if len(batch) < EXPORT_CHUNK_SIZE:
+                break
+    finally:
+        writer.close()
+
+    yield sink.drain()
+
+
+def stream_export(kind, fmt="csv", start=None, end=None, user=None):
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"Unknown format '{fmt}'")
+    if fmt == "parquet" and pa is None:
+        raise ExportError("Parquet export ke liye pyarrow install karein")
+
+    rows = iter_export_rows(kind, start=start, end=end, user=user)
+    if fmt == "parquet":
+        return stream_parquet(kind, rows)
+    return stream_csv(kind, rows)
@@ -0,0 +1,100 @@
+"""
+1-14 din ka forecast (ingredients ek hafta pehle order hote hain).
+
+Har restaurant ka last din jisme planned + close_day dono hain, wo base hai; maths
+core/ml.py ke forecast_days me, saare restaurants ek saath. Result cache
+me rehta hai jab tak naya / edited close_day na aaye ya model retrain na ho
+(cache key me close entry ka id + updated_at aur models ka mtime hai).
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Subquery
+
+from .analytics import DISHES
+from .ml import FORECAST_MAX_DAYS, forecast_days, models_version
+from .models import FoodEntry, CloseDayEntry
+
+FORECAST_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _cache_key(closed, version):
+    return f"forecast:{closed.user_id}:{closed.id}:{closed.updated_at.timestamp()}:{version}"
+
+
+def forecast_for_users(user_ids, days=7):
+    """
+    {user_id: {"based_on": date, "days": [{date, dal, chawal, sabji}]}}.
+    Jiske paas ek bhi poora (planned + closed) din nahi, wo result me nahi aata.
+    Queries restaurants ki ginti se independent: latest close, uska planned.
+    """
+    days = min(max(int(days), 1), FORECAST_MAX_DAYS)
+    same_day_plan = FoodEntry.objects.filter(user=OuterRef("user"), date=OuterRef("date"))
+    latest_close = (
+        CloseDayEntry.objects.filter(Exists(same_day_plan), user=OuterRef("pk"))
+        .order_by("-date", "-id").values("id")[:1]
+    )
+    close_ids = (
+        User.objects.filter(id__in=list(user_ids))
+        .annotate(close_id=Subquery(latest_close))
+        .exclude(close_id=None).values_list("close_id", flat=True)
+    )
+    closes = list(CloseDayEntry.objects.filter(id__in=close_ids).only(
+        "id", "user_id", "date", "updated_at",
+        *[f"sold_{dish}_qty" for dish in DISHES], *[f"{dish}_waste_qty" for dish in DISHES],
+    ))
+    if not closes:
+        return {}
+
+    version = models_version()
+    keys = {closed.user_id: _cache_key(closed, version) for closed in closes}
+    cached = cache.get_many(keys.values())
+
+    missing = [closed for closed in closes if keys[closed.user_id] not in cached]
+    if missing:
+        latest_planned = (
+            FoodEntry.objects.filter(user=OuterRef("user"), date=OuterRef("date"))
+            .order_by("-id").values("id")[:1]
+        )
+        planned_ids = (
+            CloseDayEntry.objects.filter(id__in=[closed.id for closed in missing])
+            .annotate(planned_id=Subquery(latest_planned))
+            .values_list("planned_id", flat=True)
+        )
+        planned = {
+            row.pop("user_id"): row
+            for row in FoodEntry.objects.filter(id__in=planned_ids)
+            .values("user_id", *[f"{dish}_qty" for dish in DISHES])
+        }
+
+        rows = []
+        for closed in missing:
+            rows.append({
+                "day_of_week": closed.date.weekday(),
+                **{f"{dish}_added": planned[closed.user_id][f"{dish}_qty"] for dish in DISHES},
+                **{f"{dish}_sold": getattr(closed, f"sold_{dish}_qty") for dish in DISHES},
+                **{f"{dish}_waste": getattr(closed, f"{dish}_waste_qty") for dish in DISHES},
+            })
+
+        # Hamesha poore 14 din cache karo, `days` sirf slice hai
+        fresh = {}
+        for closed, plates in zip(missing, forecast_days(rows, FORECAST_MAX_DAYS)):
+            fresh[keys[closed.user_id]] = {
+                "based_on": closed.date.isoformat(),
+                "days": [
+                    {"date": (closed.date + timedelta(days=offset + 1)).isoformat(), **day}
+                    for offset, day in enumerate(plates)
+                ],
+            }
+        cache.set_many(fresh, FORECAST_CACHE_TIMEOUT)
+        cached.update(fresh)
+
+    return {
+        user_id: {**cached[key], "days": cached[key]["days"][:days]}
+        for user_id, key in keys.items() if key in cached
+    }
+
+
+def restaurant_forecast(user, days=7):
+    return forecast_for_users([user.id], days).get(user.id, {"based_on": None, "days": []})
@@ -0,0 +1,57 @@
+"""
+Shared helpers: views, background jobs aur imports teeno yahi use karte hain.
+"""
+import csv
+from pathlib import Path
+
+from .models import FoodEntry, CloseDayEntry
+from .quantity import parse_qty
+
+ML_DATA_PATH = Path("ml_data.csv")
+
+
+def get_latest_entry(model, user, date):
+    """
+    Kisi user ke liye given date par agar multiple entries hain
+    to latest wali entry return karta hai.
+    """
+    return model.objects.filter(user=user, date=date).order_by('-id').first()
+
+
+def build_ml_features_for_day(user, date):
+    """
+    ML model ke liye required features database se collect karta hai.
+    """
+    planned = get_latest_entry(FoodEntry, user, date)
+    closed = get_latest_entry(CloseDayEntry, user, date)
+
+    if not planned or not closed:
+        return None
+
+    return {
+        "day_of_week": date.weekday(),
+        "dal_added": parse_qty(planned.dal),
+        "chawal_added": parse_qty(planned.chawal),
+        "sabji_added": parse_qty(planned.sabji),
+        "dal_sold": parse_qty(closed.sold_dal),
+        "chawal_sold": parse_qty(closed.sold_chawal),
+        "sabji_sold": parse_qty(closed.sold_sabji),
+        "dal_waste": parse_qty(closed.dal_waste),
+        "chawal_waste": parse_qty(closed.chawal_waste),
+        "sabji_waste": parse_qty(closed.sabji_waste),
+    }
+
+
+def append_ml_row_to_csv(features):
+    """
+    Har din ka ML training data CSV file me store karta hai
+    jisse future me model retrain ho sake.
+    """
+    file_path = ML_DATA_PATH
+    file_exists = file_path.exists()
+
+    with open(file_path, "a", newline="") as f:
+        writer = csv.writer(f)
+        if not file_exists:
+            writer.writerow(features.keys())
+        writer.writerow(features.values())
@@ -0,0 +1,304 @@
+"""
+Bulk historical import.
+
+Spreadsheet / JSON se planned, sold aur waste data ek saath load karta hai.
+Quantities pandas me column-wise normalize hoti hain, waste aur ML feature
+rows set-wise nikalte hain, aur DB writes chunks me bulk_create /
+bulk_update se hote hain. Poori file pehle validate hoti hai aur saare
+chunks ek hi transaction me: ya poora import, ya kuch nahi.
+"""
+import io
+import json
+
+import pandas as pd
+from django.db import transaction
+from django.utils.timezone import now
+
+from .analytics import invalidate_rollups
+from .helpers import ML_DATA_PATH
+from .models import FoodEntry, CloseDayEntry, WasteRollup
+from .quantity import parse_qty, parse_qty_batch, format_qty_batch
+from .search import refresh_documents
+
+# Ek bulk statement me kitne din likhe jayenge
+IMPORT_BATCH_SIZE = 1000
+
+DISHES = ("dal", "chawal", "sabji")
+PLANNED_COLUMNS = list(DISHES)
+SOLD_COLUMNS = [f"sold_{dish}" for dish in DISHES]
+WASTE_COLUMNS = [f"{dish}_waste" for dish in DISHES]
+# bulk_create save() skip karta hai, isliye numeric *_qty columns yahin bharte hain
+PLANNED_FIELDS = (
+    PLANNED_COLUMNS + [f"{col}_qty" for col in PLANNED_COLUMNS] + ["updated_at"]
+)
+CLOSED_FIELDS = (
+    SOLD_COLUMNS + WASTE_COLUMNS
+    + [f"{col}_qty" for col in SOLD_COLUMNS + WASTE_COLUMNS]
+    + ["updated_at"]
+)
+ML_COLUMNS = (
+    ["day_of_week"]
+    + [f"{dish}_added" for dish in DISHES]
+    + [f"{dish}_sold" for dish in DISHES]
+    + [f"{dish}_waste" for dish in DISHES]
+)
+
+
+class HistoryImportError(ValueError):
+    """
+    Invalid import data. `errors` me row-wise messages hote hain.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(errors[:5]))
+
+
+def read_records(data, fmt):
+    """
+    CSV text/bytes ya JSON (list ya {"rows": [...]}) ko DataFrame me badalta hai.
+    """
+    if isinstance(data, bytes):
+        data = data.decode("utf-8-sig")
+
+    if fmt == "csv":
+        return pd.read_csv(io.StringIO(data), dtype=str, keep_default_na=False)
+
+    if fmt == "json":
+        payload = json.loads(data) if isinstance(data, str) else data
+        if isinstance(payload, dict):
+            payload = payload.get("rows", [])
+        if not isinstance(payload, list):
+            raise HistoryImportError(["JSON must be a list of rows or {\"rows\": [...]}"])
+        return pd.DataFrame.from_records(payload)
+
+    raise HistoryImportError([f"Unknown format '{fmt}'"])
+
+
+def normalize_records(df):
+    """
+    Columns validate karke ek clean frame deta hai:
+    date + raw quantity strings + numeric *_num columns.
+    Same (restaurant, date) dobara aaye to last row jeetti hai.
+    """
+    if "date" not in df.columns:
+        raise HistoryImportError(["Missing required column 'date'"])
+
+    df = df.copy()
+    for col in PLANNED_COLUMNS + SOLD_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+        df[col] = df[col].fillna("").astype(str).str.strip()
+
+    errors = []
+    dates = pd.to_datetime(df["date"], errors="coerce", format="%Y-%m-%d")
+    for idx in df.index[dates.isna()]:
+        errors.append(f"row {idx + 1}: invalid date '{df.at[idx, 'date']}'")
+    df["date"] = dates.dt.date
+
+    for col in PLANNED_COLUMNS + SOLD_COLUMNS:
+        df[f"{col}_num"], invalid = parse_qty_batch(df[col])
+        for idx in df.index[invalid]:
+            errors.append(f"row {idx + 1}: invalid quantity '{df.at[idx, col]}' in '{col}'")
+
+    if errors:
+        raise HistoryImportError(errors)
+
+    df["has_planned"] = (df[PLANNED_COLUMNS] != "").any(axis=1)
+    df["has_sold"] = (df[SOLD_COLUMNS] != "").any(axis=1)
+
+    keys = ["restaurant", "date"] if "restaurant" in df.columns else ["date"]
+    return df.drop_duplicates(subset=keys, keep="last").sort_values("date")
+
+
+def _latest_by_date(model, user, dates):
+    """
+    Har date ki latest entry (get_latest_entry jaisa), ek hi query me.
+    """
+    latest = {}
+    for entry in model.objects.filter(user=user, date__in=dates).order_by("date", "-id"):
+        latest.setdefault(entry.date, entry)
+    return latest
+
+
+def _bulk_upsert(model, objs, fields):
+    """
+    Existing rows ko INSERT ... ON CONFLICT(id) DO UPDATE se likhta hai.
+    bulk_update ke CASE WHEN se kaafi tez hai, ek statement per batch.
+    """
+    model.objects.bulk_create(
+        objs, update_conflicts=True, unique_fields=["id"], update_fields=fields
+    )
+
+
+def _import_chunk(user, chunk):
+    stats = {"planned_created": 0, "planned_updated": 0,
+             "closed_created": 0, "closed_updated": 0}
+    dates = list(chunk["date"])
+    planned_existing = _latest_by_date(FoodEntry, user, dates)
+    closed_existing = _latest_by_date(CloseDayEntry, user, dates)
+
+    # Input me planned na ho to DB ka planned use hota hai (close_day jaisa)
+    planned_num = pd.DataFrame(index=chunk.index)
+    for dish in DISHES:
+        from_db = chunk["date"].map(
+            {d: parse_qty(getattr(entry, dish)) for d, entry in planned_existing.items()}
+        )
+        planned_num[dish] = chunk[f"{dish}_num"].where(chunk["has_planned"], from_db)
+
+    # ---------- Planned ----------
+    to_create, to_update = [], []
+    for row in chunk[chunk["has_planned"]].itertuples(index=False):
+        entry = planned_existing.get(row.date)
+        if entry is None:
+            entry = FoodEntry(user=user, date=row.date)
+            to_create.append(entry)
+        else:
+            to_update.append(entry)
+        entry.dal, entry.chawal, entry.sabji = row.dal, row.chawal, row.sabji
+        entry.dal_qty, entry.chawal_qty, entry.sabji_qty = (
+            row.dal_num, row.chawal_num, row.sabji_num
+        )
+
+    FoodEntry.objects.bulk_create(to_create)
+    _bulk_upsert(FoodEntry, to_update, PLANNED_FIELDS)
+    stats["planned_created"] += len(to_create)
+    stats["planned_updated"] += len(to_update)
+
+    # ---------- Waste (set-wise) ----------
+    has_plan = chunk["has_planned"] | chunk["date"].isin(list(planned_existing))
+    for dish in DISHES:
+        waste = (planned_num[dish].fillna(0) - chunk[f"sold_{dish}_num"]).clip(lower=0)
+        chunk[f"{dish}_waste"] = waste.where(has_plan, 0)
+        chunk[f"{dish}_waste_str"] = format_qty_batch(chunk[f"{dish}_waste"])
+
+    # ---------- Close Day ----------
+    to_create, to_update = [], []
+    sold = chunk[chunk["has_sold"]]
+    for row in sold.itertuples(index=False):
+        entry = closed_existing.get(row.date)
+        if entry is None:
+            entry = CloseDayEntry(user=user, date=row.date)
+            to_create.append(entry)
+        else:
+            to_update.append(entry)
+        entry.sold_dal, entry.sold_chawal, entry.sold_sabji = (
+            row.sold_dal, row.sold_chawal, row.sold_sabji
+        )
+        entry.dal_waste, entry.chawal_waste, entry.sabji_waste = (
+            row.dal_waste_str, row.chawal_waste_str, row.sabji_waste_str
+        )
+        entry.sold_dal_qty, entry.sold_chawal_qty, entry.sold_sabji_qty = (
+            row.sold_dal_num, row.sold_chawal_num, row.sold_sabji_num
+        )
+        entry.dal_waste_qty, entry.chawal_waste_qty, entry.sabji_waste_qty = (
+            row.dal_waste, row.chawal_waste, row.sabji_waste
+        )
+
+    CloseDayEntry.objects.bulk_create(to_create)
+    _bulk_upsert(CloseDayEntry, to_update, CLOSED_FIELDS)
+    stats["closed_created"] += len(to_create)
+    stats["closed_updated"] += len(to_update)
+
+    invalidate_rollups(user, dates)
+
+    # ---------- ML feature rows ----------
+    ready = chunk["has_sold"] & has_plan
+    features = pd.DataFrame({
+        "day_of_week": pd.to_datetime(chunk["date"]).dt.weekday,
+        **{f"{dish}_added": planned_num[dish] for dish in DISHES},
+        **{f"{dish}_sold": chunk[f"sold_{dish}_num"] for dish in DISHES},
+        **{f"{dish}_waste": chunk[f"{dish}_waste"] for dish in DISHES},
+    })[ready]
+
+    return stats, features[ML_COLUMNS].round(2)
+
+
+def append_ml_frame_to_csv(features):
+    """
+    append_ml_row_to_csv ka bulk version: saari rows ek write me.
+    """
+    if features.empty:
+        return
+    features.to_csv(
+        ML_DATA_PATH, mode="a", index=False, header=not ML_DATA_PATH.exists()
+    )
+
+
+def _reject_archived_months(groups):
+    """
+    Archive ho chuke mahino ke rows ka sirf weekday-wise total bacha hai;
+    un mahino me naya / badla din rollup me sahi se nahi jud sakta.
+    """
+    errors = []
+    for owner, frame in groups:
+        months = {day.replace(day=1) for day in frame["date"]}
+        archived = (
+            WasteRollup.objects.filter(user=owner, month__in=months, archived=True)
+            .values_list("month", flat=True).distinct()
+        )
+        errors += [
+            f"{owner.username}: {month:%Y-%m} is already archived and cannot be changed"
+            for month in sorted(archived)
+        ]
+    if errors:
+        raise HistoryImportError(errors)
+
+
+def import_history(df, user=None, users=None):
+    """
+    Normalized records likhta hai. Ya to ek `user` do, ya phir frame me
+    `restaurant` column ho aur `users` (username -> User) mapping do.
+    `user` ke saath `restaurant` column sirf usi user ka (ya khali) ho
+    sakta hai, warna do restaurants ke rows ek account me chale jate.
+    """
+    if user is not None and "restaurant" in df.columns:
+        names = df["restaurant"].fillna("").astype(str).str.strip()
+        others = sorted(set(names) - {"", user.username})
+        if others:
+            raise HistoryImportError([
+                f"Rows for restaurant '{name}' cannot be imported into '{user.username}'"
+                for name in others
+            ])
+        df = df.drop(columns=["restaurant"])
+    df = normalize_records(df)
+    totals = {"planned_created": 0, "planned_updated": 0,
+              "closed_created": 0, "closed_updated": 0, "ml_rows": 0}
+
+    if user is not None:
+        groups = [(user, df)]
+    else:
+        if "restaurant" not in df.columns:
+            raise HistoryImportError(["Missing column 'restaurant' (or pass a user)"])
+        unknown = sorted(set(df["restaurant"]) - set(users))
+        if unknown:
+            raise HistoryImportError([f"Unknown restaurant '{name}'" for name in unknown])
+        groups = [(users[name], frame) for name, frame in df.groupby("restaurant")]
+
+    _reject_archived_months(groups)
+
+    feature_frames = []
+    today = now().date()
+    touched_today = []
+    # Beech me DB error aaye to pehle ke chunks bhi rollback, aadha import nahi
+    with transaction.atomic():
+        for owner, frame in groups:
+            if (frame["date"] == today).any():
+                touched_today.append(owner.id)
+            for start in range(0, len(frame), IMPORT_BATCH_SIZE):
+                chunk = frame.iloc[start:start + IMPORT_BATCH_SIZE].copy()
+                stats, features = _import_chunk(owner, chunk)
+                for key, value in stats.items():
+                    totals[key] += value
+                feature_frames.append(features)
+
+    if feature_frames:
+        features = pd.concat(feature_frames)
+        # Outer transaction (e.g. sync API) rollback ho to CSV me kuch na jaye
+        transaction.on_commit(lambda: append_ml_frame_to_csv(features))
+        totals["ml_rows"] = len(features)
+
+    # bulk_create signals nahi bhejta; aaj ka surplus search me khud update karo
+    refresh_documents(touched_today, today)
+
+    return totals
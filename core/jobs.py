@@ -0,0 +1,44 @@
+"""
+Background jobs. CoreConfig.ready() is module ko import karta hai
+taaki saare @task registry me aa jayein.
+"""
+from django.contrib.auth.models import User
+from django.utils.dateparse import parse_date
+
+from .helpers import append_ml_row_to_csv, build_ml_features_for_day
+from .monitoring import track_day
+from .tasks import task
+from .training import train_models
+
+
+@task("record_ml_row")
+def record_ml_row(user_id, date):
+    """
+    close_day ke baad us din ki ML feature row CSV me append karta hai.
+    """
+    user = User.objects.filter(id=user_id).first()
+    if user is None:
+        return
+
+    features = build_ml_features_for_day(user, parse_date(date))
+    if features:
+        append_ml_row_to_csv(features)
+
+
+@task("track_predictions")
+def track_predictions(user_id, date):
+    """
+    close_day ke baad: kal ki prediction vs aaj ka sold (drift stats),
+    aur kal ke liye nayi prediction store (core/monitoring.py).
+    """
+    user = User.objects.filter(id=user_id).first()
+    if user is not None:
+        track_day(user, parse_date(date))
+
+
+@task("retrain_models")
+def retrain_models():
+    """
+    Drift par models dobara train; workers agli call par naye load karte hain.
+    """
+    train_models()
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from core.retention import (
+    ARCHIVE_BATCH_SIZE, pending_counts, retention_cutoff, run_retention,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "RETENTION_DAYS se purani daily rows ko monthly rollups me fold karke "
+        "gzip CSV me archive karta hai aur hot tables se delete karta hai"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Override settings.RETENTION_DAYS")
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Sirf batao kitni rows jayengi"
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            cutoff = retention_cutoff(options["days"])
+            self.stdout.write(f"Cutoff: {cutoff}")
+            for kind, count in pending_counts(cutoff).items():
+                self.stdout.write(f"  {kind}: {count} rows")
+            return
+
+        stats = run_retention(options["days"], options["batch_size"])
+        self.stdout.write(f"Cutoff: {stats['cutoff']}, rollup rows: {stats['rollups']}")
+        if stats["late_users"]:
+            self.stdout.write(self.style.WARNING(
+                f"  {stats['late_users']} late row group(s) in already archived months "
+                "were archived to file but not folded again"
+            ))
+        for path in stats["files"]:
+            self.stdout.write(f"  archived -> {path}")
+        self.stdout.write(self.style.SUCCESS(
+            ", ".join(f"{kind}={stats[kind]}" for kind in ("planned", "closed", "requests"))
+        ))
@@ -0,0 +1,175 @@
+import random
+import statistics
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models.functions import ExtractWeekDay
+from django.utils.timezone import now
+
+from core.analytics import grouped_totals
+from core.helpers import get_latest_entry
+from core.models import FoodEntry, CloseDayEntry, FoodRequest
+
+STRESS_PREFIX = "db_stress_"
+
+# SQLite ke apne defaults (tuning se pehle wali halat), comparison ke liye
+SQLITE_DEFAULT_PRAGMAS = {
+    "journal_mode": "DELETE",
+    "synchronous": "FULL",
+    "busy_timeout": 5000,
+    "mmap_size": 0,
+    "cache_size": -2000,
+    "temp_store": "DEFAULT",
+}
+
+
+def _reset_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            for name, value in SQLITE_DEFAULT_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def write_day(user, day):
+    """
+    add_food + close_day jaisa: ek transaction me planned aur closed upsert.
+    """
+    dal, chawal, sabji = (random.randint(5, 40) for _ in range(3))
+    with transaction.atomic():
+        planned = get_latest_entry(FoodEntry, user, day)
+        if planned is None:
+            planned = FoodEntry(user=user, date=day)
+        planned.dal, planned.chawal, planned.sabji = str(dal), str(chawal), str(sabji)
+        planned.save()
+
+        closed = get_latest_entry(CloseDayEntry, user, day) or CloseDayEntry(user=user, date=day)
+        closed.sold_dal = str(random.randint(0, dal))
+        closed.sold_chawal = str(random.randint(0, chawal))
+        closed.sold_sabji = str(random.randint(0, sabji))
+        closed.dal_waste = closed.chawal_waste = closed.sabji_waste = "0"
+        closed.save()
+
+
+def read_dashboard(user, day, heavy):
+    """
+    restaurant_dashboard ki queries; `heavy` par 30 din ka analytics bhi.
+    """
+    get_latest_entry(FoodEntry, user, day)
+    get_latest_entry(CloseDayEntry, user, day)
+    list(FoodRequest.objects.filter(restaurant=user).order_by("-created_at")[:50])
+    if heavy:
+        grouped_totals(user, day - timedelta(days=30), day, weekday=ExtractWeekDay("date"))
+
+
+class Command(BaseCommand):
+    help = (
+        "Local concurrency stress test: readers (dashboard) aur writers "
+        "(add_food + close_day) threads configured database par chalate hain. "
+        "Sirf dev / staging copy par: --yes-i-mean-it zaroori"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=4)
+        parser.add_argument("--seconds", type=float, default=10)
+        parser.add_argument(
+            "--profile", choices=["tuned", "default"], default="tuned",
+            help="SQLite: 'default' = bina PRAGMA tuning ke, comparison ke liye",
+        )
+        parser.add_argument(
+            "--yes-i-mean-it", action="store_true",
+            help="Haan, is database me test users aur rows likho (baad me sirf wahi delete)",
+        )
+
+    def handle(self, *args, **options):
+        db_name = connection.settings_dict["NAME"]
+        if not options["yes_i_mean_it"]:
+            raise CommandError(
+                f"db_stress writes test users and entries into '{db_name}'. "
+                "Point DATABASES at a dev / staging copy and pass --yes-i-mean-it."
+            )
+
+        if options["profile"] == "default" and connection.vendor == "sqlite":
+            connection_created.connect(_reset_sqlite_pragmas, dispatch_uid="db_stress.reset")
+            settings_dict = connections.settings["default"]
+            settings_dict["OPTIONS"] = {
+                k: v for k, v in settings_dict.get("OPTIONS", {}).items() if k != "transaction_mode"
+            }
+            connection.close()
+
+        # Har run ke naye users: cleanup sirf inhi ids ko (aur cascade me
+        # inki rows ko) delete karta hai, kisi pehle se maujood user ko nahi
+        run_id = uuid.uuid4().hex[:8]
+        users = [
+            User.objects.create(username=f"{STRESS_PREFIX}{run_id}_{i}")
+            for i in range(max(options["writers"], 1))
+        ]
+        try:
+            self._run(users, options)
+        finally:
+            User.objects.filter(id__in=[user.id for user in users]).delete()
+
+    def _run(self, users, options):
+        today = now().date()
+        deadline = time.perf_counter() + options["seconds"]
+        results = {"read": [], "write": []}
+        errors = {"read": 0, "write": 0}
+        lock = threading.Lock()
+
+        def worker(role, seed):
+            rng = random.Random(seed)
+            latencies, failed, ops = [], 0, 0
+            try:
+                while time.perf_counter() < deadline:
+                    user = rng.choice(users)
+                    day = today - timedelta(days=rng.randint(0, 60))
+                    started = time.perf_counter()
+                    try:
+                        if role == "write":
+                            write_day(user, day)
+                        else:
+                            read_dashboard(user, day, heavy=ops % 5 == 0)
+                    except OperationalError:
+                        failed += 1
+                    else:
+                        latencies.append(time.perf_counter() - started)
+                    ops += 1
+            finally:
+                connections.close_all()
+                with lock:
+                    results[role] += latencies
+                    errors[role] += failed
+
+        threads = [
+            threading.Thread(target=worker, args=("read", i)) for i in range(options["readers"])
+        ] + [
+            threading.Thread(target=worker, args=("write", 1000 + i)) for i in range(options["writers"])
+        ]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{connection.vendor} / profile={options['profile']} / "
+            f"{options['readers']} readers, {options['writers']} writers, {elapsed:.1f}s"
+        )
+        for role in ("read", "write"):
+            latencies = sorted(results[role])
+            if not latencies:
+                self.stdout.write(f"  {role:<6} no successful ops, errors={errors[role]}")
+                continue
+            q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+            self.stdout.write(
+                f"  {role:<6} ops={len(latencies):<7} {len(latencies) / elapsed:>8.1f}/s  "
+                f"p50={q[49] * 1000:.1f}ms p95={q[94] * 1000:.1f}ms p99={q[98] * 1000:.1f}ms "
+                f"max={latencies[-1] * 1000:.1f}ms errors={errors[role]}"
+            )
@@ -0,0 +1,59 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from core.exports import EXPORTS, EXPORT_FORMATS, ExportError, stream_export
+
+
+class Command(BaseCommand):
+    help = "Planned / close-day / request history ko CSV ya Parquet me stream karta hai"
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(EXPORTS))
+        parser.add_argument("--start", help="YYYY-MM-DD (inclusive)")
+        parser.add_argument("--end", help="YYYY-MM-DD (inclusive)")
+        parser.add_argument("--user", help="Sirf is restaurant username ki history")
+        parser.add_argument("--format", default="csv", choices=EXPORT_FORMATS)
+        parser.add_argument("--output", "-o", help="File path (default: stdout)")
+
+    def handle(self, *args, **options):
+        start = self._date(options["start"])
+        end = self._date(options["end"])
+
+        user = None
+        if options["user"]:
+            user = User.objects.filter(username=options["user"]).first()
+            if user is None:
+                raise CommandError(f"User '{options['user']}' not found")
+
+        try:
+            chunks = stream_export(
+                options["kind"], options["format"], start=start, end=end, user=user
+            )
+        except ExportError as exc:
+            raise CommandError(str(exc))
+
+        binary = options["format"] == "parquet"
+        if options["output"]:
+            mode = "wb" if binary else "w"
+            with open(options["output"], mode, newline=None if binary else "") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        else:
+            out = sys.stdout.buffer if binary else sys.stdout
+            for chunk in chunks:
+                out.write(chunk)
+            out.flush()
+
+    def _date(self, value):
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise CommandError(f"Invalid date '{value}', expected YYYY-MM-DD")
+        return parsed
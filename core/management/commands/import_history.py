@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.imports import HistoryImportError, import_history, read_records
+
+
+class Command(BaseCommand):
+    help = "CSV / JSON se planned, sold aur waste history bulk me import karta hai"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--user",
+            help="Saari rows is restaurant ki; warna file me 'restaurant' column chahiye",
+        )
+        parser.add_argument("--format", choices=("csv", "json"))
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"File '{path}' not found")
+        fmt = options["format"] or ("json" if path.suffix.lower() == ".json" else "csv")
+
+        try:
+            df = read_records(path.read_bytes(), fmt)
+            if options["user"]:
+                user = User.objects.filter(username=options["user"]).first()
+                if user is None:
+                    raise CommandError(f"User '{options['user']}' not found")
+                stats = import_history(df, user=user)
+            else:
+                names = set(df["restaurant"]) if "restaurant" in df.columns else set()
+                users = {u.username: u for u in User.objects.filter(username__in=names)}
+                stats = import_history(df, users=users)
+        except HistoryImportError as exc:
+            for error in exc.errors[:20]:
+                self.stderr.write(error)
+            raise CommandError(f"Import failed ({len(exc.errors)} errors)")
+
+        self.stdout.write(self.style.SUCCESS(
+            ", ".join(f"{key}={value}" for key, value in stats.items())
+        ))
@@ -0,0 +1,25 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.search import refresh_documents
+
+BATCH_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = "Saare restaurants ki search rows (aur aaj ka surplus) dobara banata hai"
+
+    def handle(self, *args, **options):
+        ids = list(User.objects.order_by("id").values_list("id", flat=True))
+        total = 0
+        for start in range(0, len(ids), BATCH_SIZE):
+            total += refresh_documents(ids[start:start + BATCH_SIZE])
+
+        if connection.vendor == "sqlite":
+            # External-content FTS index ko table se poora dobara banao
+            with connection.cursor() as cursor:
+                cursor.execute("INSERT INTO core_search_fts(core_search_fts) VALUES ('rebuild')")
+                cursor.execute("INSERT INTO core_search_fts(core_search_fts) VALUES ('optimize')")
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} restaurants"))
@@ -0,0 +1,43 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.notifications import purge_notifications
+from core.tasks import purge_done, run_pending
+
+
+class Command(BaseCommand):
+    help = "Background task worker. Zyada throughput ke liye kai processes chalayein."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true", help="Pending tasks drain karke exit"
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=1.0, help="Queue khali ho to kitne second ruke"
+        )
+
+    def handle(self, *args, **options):
+        self._stop = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        if options["once"]:
+            count = run_pending()
+            self.stdout.write(self.style.SUCCESS(f"Ran {count} task(s)"))
+            return
+
+        self.stdout.write("Worker started")
+        last_purge = 0
+        while not self._stop:
+            if not run_pending(limit=100):
+                time.sleep(options["sleep"])
+            if time.monotonic() - last_purge > 3600:
+                purge_done()
+                purge_notifications()
+                last_purge = time.monotonic()
+        self.stdout.write("Worker stopped")
+
+    def _request_stop(self, *args):
+        self._stop = True
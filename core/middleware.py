@@ -0,0 +1,99 @@
+"""
+Project middleware.
+"""
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+# ManifestStaticFilesStorage ka hash: name.<12 hex>.ext
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{12}\.[^/]+$")
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+SHORT_CACHE = "public, max-age=3600"
+
+
+class StaticAssetMiddleware:
+    """
+    STATIC_ROOT (collectstatic output) se static files serve karta hai,
+    session / auth middleware se pehle.
+    - Hashed files: 1 saal, immutable (naam hi version hai)
+    - Accept-Encoding ke hisaab se precompressed .br / .gz variant
+    Nginx / CDN ho to ye kaam wahan bhi ho sakta hai; ye bina unke bhi chalta hai.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = "/" + settings.STATIC_URL.strip("/") + "/"
+        self.root = getattr(settings, "STATIC_ROOT", None)
+
+    def __call__(self, request):
+        if self.root and request.method in ("GET", "HEAD") and request.path.startswith(self.prefix):
+            response = self.serve(request, request.path[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(self.root, name)
+        except ValueError:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        stat = os.stat(path)
+        if not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"), stat.st_mtime):
+            return HttpResponseNotModified()
+
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        accepted = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        encoding = None
+        for token, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if token in accepted and os.path.isfile(path + suffix):
+                encoding, path = token, path + suffix
+                break
+
+        response = FileResponse(
+            open(path, "rb"), content_type=content_type, filename=os.path.basename(name)
+        )
+        if encoding:
+            response["Content-Encoding"] = encoding
+        response["Vary"] = "Accept-Encoding"
+        response["Last-Modified"] = http_date(stat.st_mtime)
+        response["Cache-Control"] = IMMUTABLE_CACHE if HASHED_NAME_RE.search(name) else SHORT_CACHE
+        return response
+
+
+class QueryCountMiddleware:
+    """
+    Har response me X-Query-Count header: is request ne kitni SQL queries
+    chalayi (session + auth + view sab). MIDDLEWARE me sabse upar rakhein.
+    settings.QUERY_COUNT_HEADER False ho to kuch nahi karta.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "QUERY_COUNT_HEADER", False)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        count = 0
+
+        def counter(execute, sql, params, many, context):
+            nonlocal count
+            count += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        response["X-Query-Count"] = str(count)
+        return response
@@ -0,0 +1,101 @@
+# Generated by Django 6.0.1 on 2026-10-19 14:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_alter_foodrequest_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WasteRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('day_of_week', models.PositiveSmallIntegerField()),
+                ('planned_days', models.PositiveIntegerField(default=0)),
+                ('closed_days', models.PositiveIntegerField(default=0)),
+                ('dal_planned', models.FloatField(default=0)),
+                ('chawal_planned', models.FloatField(default=0)),
+                ('sabji_planned', models.FloatField(default=0)),
+                ('dal_sold', models.FloatField(default=0)),
+                ('chawal_sold', models.FloatField(default=0)),
+                ('sabji_sold', models.FloatField(default=0)),
+                ('dal_waste', models.FloatField(default=0)),
+                ('chawal_waste', models.FloatField(default=0)),
+                ('sabji_waste', models.FloatField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='closedayentry',
+            name='chawal_waste_qty',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='closedayentry',
+            name='dal_waste_qty',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='closedayentry',
+            name='sabji_waste_qty',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='closedayentry',
+            name='sold_chawal_qty',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='closedayentry',
+            name='sold_dal_qty',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='closedayentry',
+            name='sold_sabji_qty',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='foodentry',
+            name='chawal_qty',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='foodentry',
+            name='dal_qty',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='foodentry',
+            name='sabji_qty',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='closedayentry',
+            index=models.Index(fields=['user', 'date'], name='core_closed_user_id_572bbb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodentry',
+            index=models.Index(fields=['user', 'date'], name='core_fooden_user_id_ec83da_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodrequest',
+            index=models.Index(fields=['restaurant', 'created_at'], name='core_foodre_restaur_56ea90_idx'),
+        ),
+        migrations.AddField(
+            model_name='wasterollup',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waste_rollups', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='wasterollup',
+            constraint=models.UniqueConstraint(fields=('user', 'month', 'day_of_week'), name='unique_waste_rollup'),
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 6.0.1 on 2026-10-19 14:07
+
+import re
+
+from django.conf import settings
+from django.db import migrations
+
+# core.quantity ki us waqt ki copy: migration runtime code badalne par bhi
+# wahi result de
+UNIT_FACTORS = {
+    "plate": 1.0, "portion": 1.0, "kg": 4.0, "g": 0.004, "litre": 4.0, "ml": 0.004,
+}
+
+UNIT_ALIASES = {
+    "plate": "plate", "plates": "plate", "plt": "plate", "plts": "plate",
+    "portion": "portion", "portions": "portion", "serving": "portion",
+    "servings": "portion", "pcs": "portion", "pc": "portion",
+    "kg": "kg", "kgs": "kg", "kilo": "kg", "kilos": "kg",
+    "kilogram": "kg", "kilograms": "kg",
+    "g": "g", "gm": "g", "gms": "g", "gram": "g", "grams": "g",
+    "l": "litre", "ltr": "litre", "ltrs": "litre", "litre": "litre",
+    "litres": "litre", "liter": "litre", "liters": "litre",
+    "ml": "ml",
+}
+
+WORD_NUMBERS = {
+    "half": 0.5, "quarter": 0.25, "one": 1.0, "two": 2.0, "three": 3.0,
+    "four": 4.0, "five": 5.0, "ten": 10.0, "dozen": 12.0,
+}
+
+QTY_RE = re.compile(
+    r"^\s*(?:(?P<num>\d+(?:\.\d+)?|\.\d+)(?:\s*/\s*(?P<den>\d+(?:\.\d+)?))?"
+    r"|(?P<word>" + "|".join(WORD_NUMBERS) + r")\b)"
+    r"\s*(?P<unit>[a-z]+)?",
+    re.IGNORECASE,
+)
+
+NUMERIC_FIELDS = {
+    "FoodEntry": {
+        "dal": "dal_qty",
+        "chawal": "chawal_qty",
+        "sabji": "sabji_qty",
+    },
+    "CloseDayEntry": {
+        "sold_dal": "sold_dal_qty",
+        "sold_chawal": "sold_chawal_qty",
+        "sold_sabji": "sold_sabji_qty",
+        "dal_waste": "dal_waste_qty",
+        "chawal_waste": "chawal_waste_qty",
+        "sabji_waste": "sabji_waste_qty",
+    },
+}
+
+
+def parse_plates(raw, factors):
+    """
+    Raw quantity -> plates; blank / samajh na aaye / "x/0" -> 0.
+    """
+    match = QTY_RE.match(raw or "")
+    if not match:
+        return 0.0
+    if match["word"]:
+        value = WORD_NUMBERS[match["word"].lower()]
+    else:
+        value = float(match["num"])
+        if match["den"]:
+            den = float(match["den"])
+            value = value / den if den else 0.0
+    unit = (match["unit"] or "").lower()
+    return value * factors.get(unit, 1.0)
+
+
+def backfill_numeric_qty(apps, schema_editor):
+    """
+    Har distinct raw value ek baar parse hoti hai aur
+    ek UPDATE ... WHERE raw = value se saari rows bhar jati hain.
+    """
+    unit_factors = {**UNIT_FACTORS, **getattr(settings, "QTY_UNIT_FACTORS", {})}
+    factors = {alias: unit_factors[unit] for alias, unit in UNIT_ALIASES.items()}
+    for model_name, fields in NUMERIC_FIELDS.items():
+        model = apps.get_model("core", model_name)
+        for raw_field, qty_field in fields.items():
+            raw_values = list(
+                model.objects.values_list(raw_field, flat=True).distinct()
+            )
+            for raw in raw_values:
+                qty = parse_plates(raw, factors)
+                if qty:
+                    model.objects.filter(**{raw_field: raw}).update(**{qty_field: float(qty)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_numeric_qty_and_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_numeric_qty, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_backfill_numeric_qty'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wasterollup',
+            name='archived',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='foodrequest',
+            index=models.Index(fields=['restaurant', 'requester_phone', 'created_at'], name='core_foodre_restaur_8be1d9_idx'),
+        ),
+    ]
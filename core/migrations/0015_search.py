@@ -0,0 +1,126 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# External-content FTS5 table; triggers har INSERT / UPDATE / DELETE (ORM,
+# bulk ya raw SQL) par index ko sync rakhte hain.
+SQLITE_FTS = [
+    """CREATE VIRTUAL TABLE core_search_fts USING fts5(
+        name, area, dishes,
+        content='core_searchdocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER core_search_ai AFTER INSERT ON core_searchdocument BEGIN
+        INSERT INTO core_search_fts(rowid, name, area, dishes)
+        VALUES (new.id, new.name, new.area, new.dishes);
+    END""",
+    """CREATE TRIGGER core_search_ad AFTER DELETE ON core_searchdocument BEGIN
+        INSERT INTO core_search_fts(core_search_fts, rowid, name, area, dishes)
+        VALUES ('delete', old.id, old.name, old.area, old.dishes);
+    END""",
+    """CREATE TRIGGER core_search_au AFTER UPDATE OF name, area, dishes ON core_searchdocument BEGIN
+        INSERT INTO core_search_fts(core_search_fts, rowid, name, area, dishes)
+        VALUES ('delete', old.id, old.name, old.area, old.dishes);
+        INSERT INTO core_search_fts(rowid, name, area, dishes)
+        VALUES (new.id, new.name, new.area, new.dishes);
+    END""",
+]
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS core_search_au",
+    "DROP TRIGGER IF EXISTS core_search_ad",
+    "DROP TRIGGER IF EXISTS core_search_ai",
+    "DROP TABLE IF EXISTS core_search_fts",
+]
+
+# Expression core/search.py ke POSTGRES_VECTOR se match hona chahiye
+POSTGRES_INDEXES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """CREATE INDEX core_search_tsv_idx ON core_searchdocument USING GIN ((
+        setweight(to_tsvector('simple', name), 'A') ||
+        setweight(to_tsvector('simple', area), 'B') ||
+        setweight(to_tsvector('simple', dishes), 'C')
+    ))""",
+    "CREATE INDEX core_search_name_trgm_idx ON core_searchdocument USING GIN (name gin_trgm_ops)",
+]
+POSTGRES_INDEXES_DROP = [
+    "DROP INDEX IF EXISTS core_search_name_trgm_idx",
+    "DROP INDEX IF EXISTS core_search_tsv_idx",
+]
+
+
+def _run(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_FTS)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_INDEXES)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_FTS_DROP)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_INDEXES_DROP)
+
+
+def create_documents(apps, schema_editor):
+    """
+    Maujooda restaurants ki search rows (sirf naam; aaj ka surplus
+    `rebuild_search_index` ya agli entry save par aata hai).
+    """
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    SearchDocument = apps.get_model("core", "SearchDocument")
+    SearchDocument.objects.bulk_create(
+        [
+            SearchDocument(user_id=user_id, username=username, name=username)
+            for user_id, username in User.objects.values_list("id", "username").iterator()
+        ],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_organization'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RestaurantProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('display_name', models.CharField(blank=True, max_length=100)),
+                ('area', models.CharField(blank=True, max_length=100)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='profile', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=150)),
+                ('name', models.CharField(max_length=200)),
+                ('area', models.CharField(blank=True, max_length=100)),
+                ('dishes', models.CharField(blank=True, max_length=100)),
+                ('surplus', models.FloatField(default=0)),
+                ('surplus_date', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_document', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['surplus_date', 'surplus'], name='core_search_surplus_b994a7_idx')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(create_documents, migrations.RunPython.noop),
+    ]
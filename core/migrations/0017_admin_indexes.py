@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_notification'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='closedayentry',
+            index=models.Index(fields=['date'], name='core_closed_date_a15e60_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodentry',
+            index=models.Index(fields=['date'], name='core_fooden_date_aef04f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodrequest',
+            index=models.Index(fields=['status', 'created_at'], name='core_foodre_status_b4fd7e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodrequest',
+            index=models.Index(fields=['created_at'], name='core_foodre_created_c965f9_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_prediction_monitoring'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='errorstat',
+            name='model_version',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='predictionrecord',
+            name='model_version',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
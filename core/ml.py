@@ -0,0 +1,161 @@
+"""
+ML models (dal / chawal / sabji) ka ek hi loader.
+
+Models process me ek baar load hote hain. Production launcher
+(Waste_Food_System/gunicorn.conf.py) unhe master process me fork se pehle
+load karta hai, taaki saare workers same memory copy-on-write share karein.
+.pkl file badle (Train_model.py dobara chala) to agli call pe reload.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from joblib import load
+
+from .analytics import DISHES
+
+MODEL_DIR = os.path.join(settings.BASE_DIR, "models")
+
+_models = {}
+_mtimes = {}
+_lock = threading.Lock()
+
+
+def model_path(dish):
+    return os.path.join(MODEL_DIR, f"{dish}_model.pkl")
+
+
+def get_models():
+    """
+    {dish: model}. Har call pe sirf file ka mtime check hota hai.
+    """
+    with _lock:
+        for dish in DISHES:
+            mtime = os.path.getmtime(model_path(dish))
+            if _mtimes.get(dish) != mtime:
+                _models[dish] = load(model_path(dish))
+                _mtimes[dish] = mtime
+        return dict(_models)
+
+
+def feature_columns(dish):
+    # Train_model.py wale hi columns, same order
+    return ["day_of_week", f"{dish}_added", f"{dish}_sold", f"{dish}_waste"]
+
+
+def predict_next_day(rows):
+    """
+    rows: build_ml_features_for_day jaise dicts (ek ya kai outlets).
+    Har dish ka ek hi predict() call saari rows ke liye.
+    Returns [{dish: plates}], kam se kam aaj ke sold se 10% zyada aur 1.
+    """
+    if not rows:
+        return []
+
+    frame = pd.DataFrame.from_records(rows)
+    models = get_models()
+    results = [{} for _ in rows]
+    for dish in DISHES:
+        predicted = np.rint(models[dish].predict(frame[feature_columns(dish)]))
+        baseline = np.trunc(frame[f"{dish}_sold"].to_numpy() * 1.1)
+        final = np.maximum(np.maximum(predicted, baseline), 1).astype(int)
+        for result, value in zip(results, final):
+            result[dish] = int(value)
+    return results
+
+
+# ================================
+# Multi-day forecast
+# ================================
+FORECAST_MAX_DAYS = 14
+
+
+def models_version():
+    # Retrain ke baad purane cached forecasts na chalein
+    return "-".join(str(int(os.path.getmtime(model_path(dish)))) for dish in DISHES)
+
+
+def _ratio(part, whole):
+    return np.divide(part, whole, out=np.zeros_like(whole), where=whole > 0)
+
+
+def _roll_linear(model, dow, first, keep, days):
+    """
+    Linear model ke liye bina loop ke closed form.
+    Agle din sold / waste aaj ke ratio se hi chalte hain, to
+    a(t+1) = u(t) + k * a(t), jahan k = c_added + c_sold*s + c_waste*w
+    aur u(t) = intercept + c_dow * weekday(t). Isliye
+    a(h) = k^(h-1) * a(1) + sum_{j=1}^{h-1} k^(h-1-j) * u(j)
+    saari rows aur saare din ek saath (N x days x days array).
+    """
+    coef, intercept = np.asarray(model.coef_, dtype=float), float(model.intercept_)
+    sold_ratio, waste_ratio = keep
+    k = coef[1] + coef[2] * sold_ratio + coef[3] * waste_ratio
+
+    steps = np.arange(days)
+    weekday = (dow[:, None] + steps[None, :]) % 7
+    offsets = intercept + coef[0] * weekday
+
+    lag = steps[:, None] - steps[None, :]
+    mask = (lag >= 0) & (steps[None, :] >= 1)
+    powers = np.where(mask, k[:, None, None] ** np.maximum(lag, 0), 0.0)
+    return k[:, None] ** steps * first[:, None] + np.einsum("nij,nj->ni", powers, offsets)
+
+
+def _roll_model(model, columns, dow, first, keep, days):
+    """
+    Non-linear models: har din ek predict() call, saari rows ek saath.
+    """
+    sold_ratio, waste_ratio = keep
+    added, out = first, [first]
+    for step in range(1, days):
+        frame = pd.DataFrame({
+            columns[0]: (dow + step) % 7,
+            columns[1]: added,
+            columns[2]: added * sold_ratio,
+            columns[3]: added * waste_ratio,
+        })
+        added = model.predict(frame)
+        out.append(added)
+    return np.stack(out, axis=1)
+
+
+def forecast_days(rows, days=7):
+    """
+    rows: predict_next_day wale hi feature dicts (har restaurant ka last
+    closed din). Returns har row ke liye `days` dicts [{dish: plates}],
+    pehla din predict_next_day ke barabar. Aage ke din model ki apni
+    prediction ko hi agla "added" maan kar chalte hain.
+    """
+    days = min(max(int(days), 1), FORECAST_MAX_DAYS)
+    if not rows:
+        return []
+
+    frame = pd.DataFrame.from_records(rows)
+    dow = frame["day_of_week"].to_numpy(dtype=int)
+    models = get_models()
+    results = [[{} for _ in range(days)] for _ in rows]
+
+    for dish in DISHES:
+        columns = feature_columns(dish)
+        model = models[dish]
+        added, sold, waste = (frame[column].to_numpy(dtype=float) for column in columns[1:])
+        keep = (_ratio(sold, added), _ratio(waste, added))
+        first = model.predict(frame[columns])
+
+        if hasattr(model, "coef_") and np.ndim(model.coef_) == 1 and len(model.coef_) == len(columns):
+            planned = _roll_linear(model, dow, first, keep, days)
+        else:
+            planned = _roll_model(model, columns, dow, first, keep, days)
+
+        # predict_next_day wala rule: pichhle din ke (expected) sold se 10% zyada
+        expected_sold = np.column_stack([sold, planned[:, :-1] * keep[0][:, None]])
+        baseline = np.trunc(expected_sold * 1.1)
+        final = np.maximum(np.maximum(np.rint(planned), baseline), 1).astype(int)
+
+        for result, values in zip(results, final):
+            for day_result, value in zip(result, values):
+                day_result[dish] = int(value)
+    return results
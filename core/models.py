@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils.timezone import now
 
+from .quantity import parse_qty
+
 
 class FoodEntry(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -12,6 +14,27 @@ class FoodEntry(models.Model):
 
     date = models.DateField(default=now)
 
+    # Numeric copies (plates) for DB-side aggregation, save() pe bharte hain
+    dal_qty = models.FloatField(default=0)
+    chawal_qty = models.FloatField(default=0)
+    sabji_qty = models.FloatField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "date"]),
+            models.Index(fields=["user", "updated_at"]),
+            # Admin date_hierarchy (saare restaurants)
+            models.Index(fields=["date"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.dal_qty = parse_qty(self.dal)
+        self.chawal_qty = parse_qty(self.chawal)
+        self.sabji_qty = parse_qty(self.sabji)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Planned - {self.user.username} - {self.date}"
 
@@ -29,6 +52,33 @@ class CloseDayEntry(models.Model):
     sabji_waste = models.CharField(default=0)
     dal_waste = models.CharField(default=0)
 
+    # Numeric copies (plates) for DB-side aggregation, save() pe bharte hain
+    sold_dal_qty = models.FloatField(default=0)
+    sold_chawal_qty = models.FloatField(default=0)
+    sold_sabji_qty = models.FloatField(default=0)
+    dal_waste_qty = models.FloatField(default=0)
+    chawal_waste_qty = models.FloatField(default=0)
+    sabji_waste_qty = models.FloatField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "date"]),
+            models.Index(fields=["user", "updated_at"]),
+            # Admin date_hierarchy (saare restaurants)
+            models.Index(fields=["date"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.sold_dal_qty = parse_qty(self.sold_dal)
+        self.sold_chawal_qty = parse_qty(self.sold_chawal)
+        self.sold_sabji_qty = parse_qty(self.sold_sabji)
+        self.dal_waste_qty = parse_qty(self.dal_waste)
+        self.chawal_waste_qty = parse_qty(self.chawal_waste)
+        self.sabji_waste_qty = parse_qty(self.sabji_waste)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Close Day - {self.user.username} - {self.date}"
 
@@ -48,6 +98,237 @@ class FoodRequest(models.Model):
     requester_phone = models.CharField(max_length=15)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["restaurant", "created_at"]),
+            models.Index(fields=["restaurant", "updated_at"]),
+            models.Index(fields=["restaurant", "requester_phone", "created_at"]),
+            # Admin status filter + date_hierarchy
+            models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.requester_name} -> {self.restaurant.username}"
+
+
+class WasteRollup(models.Model):
+    """
+    Band ho chuke mahino ka precomputed aggregate,
+    per restaurant + month + weekday (0 = Monday).
+    Analytics multi-year charts isi se banate hain.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="waste_rollups")
+    month = models.DateField()  # mahine ka pehla din
+    day_of_week = models.PositiveSmallIntegerField()
+
+    planned_days = models.PositiveIntegerField(default=0)
+    closed_days = models.PositiveIntegerField(default=0)
+
+    dal_planned = models.FloatField(default=0)
+    chawal_planned = models.FloatField(default=0)
+    sabji_planned = models.FloatField(default=0)
+    dal_sold = models.FloatField(default=0)
+    chawal_sold = models.FloatField(default=0)
+    sabji_sold = models.FloatField(default=0)
+    dal_waste = models.FloatField(default=0)
+    chawal_waste = models.FloatField(default=0)
+    sabji_waste = models.FloatField(default=0)
+
+    # True = is mahine ki raw rows archive ho chuki hain (core/retention.py)
+    archived = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "month", "day_of_week"], name="unique_waste_rollup"
+            )
+        ]
+
+    def __str__(self):
+        return f"Rollup - {self.user.username} - {self.month:%Y-%m} - {self.day_of_week}"
+
+
+class Task(models.Model):
+    """
+    DB-backed background job (core/tasks.py). `run_worker` command
+    inhe claim karke chalata hai; fail hone par backoff ke saath retry.
+    """
+    STATUS_CHOICES = (
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    )
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField(default=now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        return f"{self.name} #{self.id} ({self.status})"
+
+
+class SyncOperation(models.Model):
+    """
+    Sync API me apply ho chuke client operation ids.
+    Same op_id dobara aaye to skip hota hai (idempotent retries).
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="sync_operations")
+    op_id = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "op_id"], name="unique_sync_op")
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.op_id}"
+
+
+class Organization(models.Model):
+    """
+    Restaurant chain: kai outlets (har outlet ek alag User) ek owner ke neeche.
+    Chain dashboard (core/chain.py) saare outlets ek saath dikhata hai.
+    """
+    name = models.CharField(max_length=100)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="owned_organizations")
+    outlets = models.ManyToManyField(User, related_name="organizations", blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class RestaurantProfile(models.Model):
+    """
+    Restaurant ki public details (search aur home page ke liye).
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
+    display_name = models.CharField(max_length=100, blank=True)
+    area = models.CharField(max_length=100, blank=True)
+
+    def __str__(self):
+        return self.display_name or self.user.username
+
+
+class SearchDocument(models.Model):
+    """
+    Har restaurant ki ek denormalized search row: naam, area aur aaj
+    jin dishes ka surplus hai. Full-text index (SQLite FTS5 / Postgres
+    GIN) isi table par hai, sync core/search.py ke signals karte hain.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="search_document")
+    username = models.CharField(max_length=150)
+    name = models.CharField(max_length=200)
+    area = models.CharField(max_length=100, blank=True)
+    dishes = models.CharField(max_length=100, blank=True)
+    surplus = models.FloatField(default=0)
+    surplus_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["surplus_date", "surplus"])]
+
+    def __str__(self):
+        return self.name
+
+
+class Notification(models.Model):
+    """
+    Requester ko jaane wala SMS / webhook message (core/notifications.py).
+    Request ke path par sirf row banti hai; bhejna background dispatcher
+    ka kaam hai, batches me aur backoff ke saath retry.
+    """
+    STATUS_CHOICES = (
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("sent", "Sent"),
+        ("superseded", "Superseded"),
+        ("failed", "Failed"),
+    )
+
+    request = models.ForeignKey(
+        FoodRequest, on_delete=models.SET_NULL, null=True, blank=True, related_name="notifications"
+    )
+    phone = models.CharField(max_length=15)
+    message = models.CharField(max_length=300)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=now)
+    claim = models.CharField(max_length=32, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+            models.Index(fields=["claim"]),
+        ]
+
+    def __str__(self):
+        return f"{self.phone} - {self.status}"
+
+
+class PredictionRecord(models.Model):
+    """
+    Kisi din ke liye di gayi prediction (us se pichhle din ke close_day par
+    bani). Us din ka close_day aane par `actual` (sold) bhara jata hai aur
+    error ErrorStat me jata hai (core/monitoring.py).
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="predictions")
+    date = models.DateField()
+    dish = models.CharField(max_length=20)
+    predicted = models.FloatField()
+    actual = models.FloatField(null=True, blank=True)
+    # Kis model se bani (core.ml.models_version)
+    model_version = models.CharField(max_length=64, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "date", "dish"], name="unique_prediction")
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.date} - {self.dish}"
+
+
+class ErrorStat(models.Model):
+    """
+    Har restaurant + dish ka running prediction error (predicted - sold,
+    plus = zyada banaya). History dobara scan nahi hoti: Welford (mean,
+    variance) aur EWMA har naye din O(1) update hote hain. Stats ek hi
+    model_version ke hain; retrain ke baad naye sire se shuru.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="error_stats")
+    dish = models.CharField(max_length=20)
+    model_version = models.CharField(max_length=64, blank=True)
+    count = models.PositiveIntegerField(default=0)
+    mean = models.FloatField(default=0)
+    m2 = models.FloatField(default=0)
+    ewma = models.FloatField(default=0)
+    ewma_abs = models.FloatField(default=0)
+    last_error = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "dish"], name="unique_error_stat")
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.dish}"
@@ -0,0 +1,215 @@
+"""
+Model drift monitoring.
+
+close_day ke baad (track_predictions job, core/jobs.py):
+1. Aaj ke liye kal store hui prediction ko aaj ke actual sold se milao,
+   error (predicted - sold) ErrorStat me O(1) fold karo (Welford + EWMA).
+2. Kal ke liye nayi prediction store karo.
+3. Kisi restaurant + dish ka EWMA bias MODEL_DRIFT_THRESHOLD plates se
+   zyada ho (aur kam se kam MODEL_DRIFT_MIN_SAMPLES din) to retrain job
+   queue, MODEL_RETRAIN_COOLDOWN_SECONDS me ek baar se zyada nahi.
+   Har prediction apna model_version rakhti hai; naye model ki pehli
+   prediction aate hi stat reset hota hai, isliye retrain ke baad drift
+   naye model par dobara MIN_SAMPLES din me naapa jata hai.
+
+metrics_text() yahi stats /metrics par Prometheus text format me deta hai.
+"""
+import logging
+import math
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Sum
+
+from .analytics import DISHES
+from .helpers import build_ml_features_for_day, get_latest_entry
+from .ml import model_path, models_version, predict_next_day
+from .models import CloseDayEntry, ErrorStat, PredictionRecord
+from .tasks import enqueue_once
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def fold_error(stat, error, alpha):
+    """
+    Ek naya error stat me: Welford (count, mean, m2) aur EWMA. Save nahi karta.
+    """
+    stat.count += 1
+    delta = error - stat.mean
+    stat.mean += delta / stat.count
+    stat.m2 += delta * (error - stat.mean)
+    if stat.count == 1:
+        stat.ewma, stat.ewma_abs = error, abs(error)
+    else:
+        stat.ewma = alpha * error + (1 - alpha) * stat.ewma
+        stat.ewma_abs = alpha * abs(error) + (1 - alpha) * stat.ewma_abs
+    stat.last_error = error
+    return stat
+
+
+def rebaseline(stat, model_version):
+    """
+    Naya model = naye stats. Purane model ka bias naye model par nahi
+    lagta, warna wahi bias har cooldown par retrain karwata rehta.
+    """
+    stat.model_version = model_version
+    stat.count, stat.mean, stat.m2 = 0, 0.0, 0.0
+    stat.ewma = stat.ewma_abs = stat.last_error = 0.0
+    return stat
+
+
+def stddev(stat):
+    return math.sqrt(stat.m2 / (stat.count - 1)) if stat.count > 1 else 0.0
+
+
+def evaluate_day(user, day):
+    """
+    `day` ki stored predictions vs us din ka actual sold. Har prediction
+    sirf ek baar count hoti hai (close_day dobara submit ho to bhi).
+    Returns updated ErrorStat list.
+    """
+    closed = get_latest_entry(CloseDayEntry, user, day)
+    if closed is None:
+        return []
+
+    alpha = _setting("MODEL_DRIFT_EWMA_ALPHA", 0.2)
+    updated = []
+    with transaction.atomic():
+        records = PredictionRecord.objects.filter(user=user, date=day, actual=None)
+        for record in records:
+            actual = getattr(closed, f"sold_{record.dish}_qty")
+            # Conditional UPDATE: do workers ek hi record do baar na ginein
+            if not PredictionRecord.objects.filter(id=record.id, actual=None).update(actual=actual):
+                continue
+            stat, _ = ErrorStat.objects.select_for_update().get_or_create(user=user, dish=record.dish)
+            if stat.model_version != record.model_version:
+                rebaseline(stat, record.model_version)
+            fold_error(stat, record.predicted - actual, alpha)
+            stat.save()
+            updated.append(stat)
+    return updated
+
+
+def record_predictions(user, day):
+    """
+    `day` ke close ke baad agle din ki prediction store (upsert).
+    """
+    features = build_ml_features_for_day(user, day)
+    if not features:
+        return None
+
+    prediction = predict_next_day([features])[0]
+    version = models_version()
+    PredictionRecord.objects.bulk_create(
+        [
+            PredictionRecord(
+                user=user, date=day + timedelta(days=1), dish=dish,
+                predicted=prediction[dish], model_version=version,
+            )
+            for dish in DISHES
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "date", "dish"],
+        update_fields=["predicted", "model_version"],
+    )
+    return prediction
+
+
+def is_drifting(stat):
+    return (
+        stat.count >= _setting("MODEL_DRIFT_MIN_SAMPLES", 7)
+        and abs(stat.ewma) > _setting("MODEL_DRIFT_THRESHOLD", 5.0)
+    )
+
+
+def models_age_seconds():
+    try:
+        return time.time() - max(os.path.getmtime(model_path(dish)) for dish in DISHES)
+    except OSError:
+        return float("inf")
+
+
+def request_retrain(stats):
+    """
+    Drift ho to retrain queue; models haal hi me bane hain to nahi.
+    """
+    drifting = [stat for stat in stats if is_drifting(stat)]
+    if not drifting:
+        return False
+    if models_age_seconds() < _setting("MODEL_RETRAIN_COOLDOWN_SECONDS", 60 * 60 * 24):
+        return False
+
+    for stat in drifting:
+        logger.warning(
+            "Prediction drift: user=%s dish=%s ewma=%.2f over %s days",
+            stat.user_id, stat.dish, stat.ewma, stat.count,
+        )
+    enqueue_once("retrain_models")
+    return True
+
+
+def track_day(user, day):
+    stats = evaluate_day(user, day)
+    record_predictions(user, day)
+    return request_retrain(stats)
+
+
+# ================================
+# /metrics
+# ================================
+def _metric(lines, name, kind, help_text, samples):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for labels, value in samples:
+        label_text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+        lines.append(f"{name}{{{label_text}}} {value:.6g}" if label_text else f"{name} {value:.6g}")
+
+
+def metrics_text():
+    """
+    Prometheus text format. Per restaurant + dish series, aur per dish
+    aggregate (ek query). MODEL_METRICS_PER_RESTAURANT=False karke sirf
+    aggregate (bahut restaurants ho to label cardinality kam).
+    """
+    lines = []
+    per_dish = list(
+        ErrorStat.objects.values("dish")
+        .annotate(samples=Sum("count"), ewma=Avg("ewma"), ewma_abs=Avg("ewma_abs"))
+        .order_by("dish")
+    )
+    _metric(lines, "foodwise_prediction_samples_total", "counter",
+            "Evaluated predictions per dish",
+            [({"dish": row["dish"]}, row["samples"]) for row in per_dish])
+    _metric(lines, "foodwise_prediction_bias_ewma_avg", "gauge",
+            "Mean over restaurants of EWMA(predicted - sold), plates",
+            [({"dish": row["dish"]}, row["ewma"]) for row in per_dish])
+    _metric(lines, "foodwise_prediction_abs_error_ewma_avg", "gauge",
+            "Mean over restaurants of EWMA(|predicted - sold|), plates",
+            [({"dish": row["dish"]}, row["ewma_abs"]) for row in per_dish])
+    age = models_age_seconds()
+    _metric(lines, "foodwise_model_age_seconds", "gauge",
+            "Seconds since the models were last trained",
+            [({}, age)] if math.isfinite(age) else [])
+
+    if _setting("MODEL_METRICS_PER_RESTAURANT", True):
+        stats = list(ErrorStat.objects.select_related("user").order_by("user__username", "dish"))
+        series = {
+            "foodwise_prediction_bias_ewma": ("EWMA(predicted - sold), plates", lambda s: s.ewma),
+            "foodwise_prediction_abs_error_ewma": ("EWMA(|predicted - sold|), plates", lambda s: s.ewma_abs),
+            "foodwise_prediction_error_mean": ("Running mean of predicted - sold (Welford)", lambda s: s.mean),
+            "foodwise_prediction_error_stddev": ("Running stddev of predicted - sold (Welford)", stddev),
+            "foodwise_prediction_samples": ("Evaluated days", lambda s: s.count),
+        }
+        for name, (help_text, value) in series.items():
+            _metric(lines, name, "gauge", help_text, [
+                ({"restaurant": stat.user.username, "dish": stat.dish}, value(stat)) for stat in stats
+            ])
+
+    return "\n".join(lines) + "\n"
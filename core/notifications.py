@@ -0,0 +1,257 @@
+"""
+Request status (accepted / rejected) ki khabar requester ke phone par.
+
+- notify_status_change(requests): view / sync sirf Notification rows banata
+  hai (ek bulk INSERT) aur ek hi dispatch job queue karta hai. Usi request
+  ke purane pending messages "superseded" ho jate hain (accept ke turant
+  baad reject kiya to sirf reject wala jayega).
+- dispatch_notifications job: due messages claim karke NOTIFY_BATCH_SIZE ke
+  batches me transport ko deta hai (ek provider call per batch). Ek phone
+  ke kai messages ek hi message me jud jate hain. Fail hone par exponential
+  backoff, NOTIFY_MAX_ATTEMPTS ke baad "failed".
+- purge_notifications(): NOTIFY_RETENTION_DAYS se purane sent / superseded /
+  failed rows delete (run_worker ghante me ek baar chalata hai).
+
+Transport settings.NOTIFY_TRANSPORT se aata hai:
+- LocalTransport: kuch bahar nahi bhejta, `outbox` me aakhri
+  LOCAL_OUTBOX_SIZE messages rakhta hai (dev / tests)
+- WebhookTransport: poora batch ek JSON POST me NOTIFY_WEBHOOK_URL par
+  (SMS gateway ya apna relay)
+"""
+import json
+import logging
+import urllib.request
+import uuid
+from collections import deque
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Notification
+from .tasks import enqueue_once, task
+
+logger = logging.getLogger(__name__)
+
+LOCAL_OUTBOX_SIZE = 1000
+
+STATUS_MESSAGES = {
+    "accepted": "Good news! {restaurant} accepted your food request #{id}. Please collect it today.",
+    "rejected": "Sorry, {restaurant} could not accept your food request #{id} this time.",
+}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+# ================================
+# Transports
+# ================================
+class LocalTransport:
+    """
+    Kuch bhejta nahi, sirf process ke andar `outbox` me rakhta hai.
+    Purane messages khud gir jate hain, lambe chalte worker ki memory na badhe.
+    """
+    outbox = deque(maxlen=LOCAL_OUTBOX_SIZE)
+
+    def send_batch(self, messages):
+        self.outbox.extend(messages)
+        for message in messages:
+            logger.info("Notification to %s: %s", message["to"], message["body"])
+        return [None] * len(messages)
+
+
+class WebhookTransport:
+    """
+    POST {"messages": [{"to", "body"}, ...]}; 2xx = poora batch sent.
+    Response me {"errors": [null | "reason", ...]} ho to per-message result.
+    """
+
+    def __init__(self):
+        self.url = _setting("NOTIFY_WEBHOOK_URL", "")
+        self.token = _setting("NOTIFY_WEBHOOK_TOKEN", "")
+        self.timeout = _setting("NOTIFY_WEBHOOK_TIMEOUT", 10)
+
+    def send_batch(self, messages):
+        if not self.url:
+            raise RuntimeError("NOTIFY_WEBHOOK_URL is not set")
+
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"messages": messages}).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        if self.token:
+            request.add_header("Authorization", f"Bearer {self.token}")
+
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            body = response.read()
+        try:
+            errors = json.loads(body or b"{}").get("errors")
+        except (ValueError, AttributeError):
+            errors = None
+        if isinstance(errors, list) and len(errors) == len(messages):
+            return errors
+        return [None] * len(messages)
+
+
+def get_transport():
+    return import_string(_setting("NOTIFY_TRANSPORT", "core.notifications.LocalTransport"))()
+
+
+# ================================
+# Request path
+# ================================
+def notify_status_change(requests):
+    """
+    requests: FoodRequest objects jinka status abhi badla (restaurant
+    select_related ho to behtar). Bulk accept me bhi sirf 2 queries + 1 job.
+    """
+    notifications = [
+        Notification(
+            request_id=req.id,
+            phone=req.requester_phone,
+            message=STATUS_MESSAGES[req.status].format(restaurant=req.restaurant.username, id=req.id),
+        )
+        for req in requests
+        if req.status in STATUS_MESSAGES and req.requester_phone
+    ]
+    if not notifications:
+        return 0
+
+    Notification.objects.filter(
+        request_id__in=[n.request_id for n in notifications], status="pending"
+    ).update(status="superseded")
+    Notification.objects.bulk_create(notifications)
+    enqueue_once("dispatch_notifications")
+    return len(notifications)
+
+
+# ================================
+# Dispatcher
+# ================================
+def _due(now):
+    # "sending" par atke rows (worker crash) lease khatam hone par wapas
+    return Q(status="pending", next_attempt_at__lte=now) | Q(status="sending", next_attempt_at__lt=now)
+
+
+def _claim_batch(size):
+    now = timezone.now()
+    lease = now + timedelta(seconds=_setting("NOTIFY_LEASE_SECONDS", 120))
+    claim = uuid.uuid4().hex
+    ids = list(
+        Notification.objects.filter(_due(now)).order_by("next_attempt_at", "id")
+        .values_list("id", flat=True)[:size]
+    )
+    if not ids:
+        return []
+    Notification.objects.filter(_due(now), id__in=ids).update(
+        status="sending", claim=claim, next_attempt_at=lease
+    )
+    return list(Notification.objects.filter(claim=claim, status="sending").order_by("id"))
+
+
+def _coalesce(batch):
+    """
+    Ek phone ke saare messages ek message me: [(phone, body, [notifications])].
+    """
+    by_phone = {}
+    for notification in batch:
+        by_phone.setdefault(notification.phone, []).append(notification)
+    return [
+        (phone, "\n".join(n.message for n in group), group)
+        for phone, group in by_phone.items()
+    ]
+
+
+def _record_failures(failed):
+    """
+    failed: [(notification, error)]. Attempts ke hisaab se group karke bulk UPDATE.
+    """
+    now = timezone.now()
+    max_attempts = _setting("NOTIFY_MAX_ATTEMPTS", 5)
+    base = _setting("NOTIFY_RETRY_BASE_SECONDS", 30)
+
+    groups = {}
+    for notification, error in failed:
+        groups.setdefault((notification.attempts + 1, error), []).append(notification.id)
+
+    for (attempts, error), ids in groups.items():
+        if attempts >= max_attempts:
+            Notification.objects.filter(id__in=ids).update(
+                status="failed", attempts=attempts, last_error=error, claim=""
+            )
+        else:
+            Notification.objects.filter(id__in=ids).update(
+                status="pending", attempts=attempts, last_error=error, claim="",
+                next_attempt_at=now + timedelta(seconds=base * 2 ** (attempts - 1)),
+            )
+
+
+def send_batch(transport, batch):
+    """
+    Ek provider call. Returns (sent, failed) counts.
+    """
+    grouped = _coalesce(batch)
+    try:
+        errors = transport.send_batch([{"to": phone, "body": body} for phone, body, _ in grouped])
+    except Exception as exc:
+        logger.warning("Notification batch of %s failed: %s", len(grouped), exc)
+        errors = [repr(exc)] * len(grouped)
+
+    sent, failed = [], []
+    for (_, _, group), error in zip(grouped, errors):
+        if error:
+            failed.extend((notification, str(error)) for notification in group)
+        else:
+            sent.extend(notification.id for notification in group)
+
+    if sent:
+        Notification.objects.filter(id__in=sent).update(
+            status="sent", sent_at=timezone.now(), claim="", last_error=""
+        )
+    if failed:
+        _record_failures(failed)
+    return len(sent), len(failed)
+
+
+@task("dispatch_notifications")
+def dispatch_notifications():
+    """
+    Saare due messages bhejta hai; retry baaki ho to agla run schedule.
+    """
+    transport = get_transport()
+    size = _setting("NOTIFY_BATCH_SIZE", 100)
+    totals = [0, 0]
+
+    while True:
+        batch = _claim_batch(size)
+        if not batch:
+            break
+        for i, count in enumerate(send_batch(transport, batch)):
+            totals[i] += count
+
+    next_retry = (
+        Notification.objects.filter(status__in=["pending", "sending"])
+        .order_by("next_attempt_at").values_list("next_attempt_at", flat=True).first()
+    )
+    if next_retry is not None:
+        delay = max((next_retry - timezone.now()).total_seconds(), 1)
+        enqueue_once("dispatch_notifications", delay=delay)
+    return tuple(totals)
+
+
+def purge_notifications(days=None):
+    """
+    Bheje ja chuke / chhode gaye messages delete; pending aur sending nahi.
+    """
+    if days is None:
+        days = _setting("NOTIFY_RETENTION_DAYS", 30)
+    cutoff = timezone.now() - timedelta(days=days)
+    return Notification.objects.filter(
+        status__in=["sent", "superseded", "failed"], created_at__lt=cutoff
+    ).delete()[0]
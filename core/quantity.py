@@ -0,0 +1,164 @@
+"""
+Quantity normalization.
+
+Form / spreadsheet se aane wali quantities ("5 plates", "1.5 kg", "2kg",
+"half", "500 ml", "3/4 litre") ko ek hi unit (plates) me badalta hai.
+
+Do APIs hain:
+- parse_qty(value)         -> ek value, request path ke liye
+- parse_qty_batch(values)  -> poora column ek saath (pandas / NumPy),
+                              imports, backfills aur training ke liye
+
+Dono same regex aur unit table use karte hain, isliye result same aata hai:
+numbers (int / float) jaise ke taise, blank / NaN / samajh na aaye / "x/0"
+-> 0. Batch wala saath me batata hai kaunsi value invalid thi.
+"""
+import math
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+# Canonical unit = plate / portion. Weight aur volume ka conversion
+# settings.QTY_UNIT_FACTORS se override ho sakta hai.
+DEFAULT_UNIT_FACTORS = {
+    "plate": 1.0,
+    "portion": 1.0,
+    "kg": 4.0,      # ~250 g per plate
+    "g": 0.004,
+    "litre": 4.0,   # ~250 ml per bowl
+    "ml": 0.004,
+}
+
+UNIT_ALIASES = {
+    "plate": "plate", "plates": "plate", "plt": "plate", "plts": "plate",
+    "portion": "portion", "portions": "portion", "serving": "portion",
+    "servings": "portion", "pcs": "portion", "pc": "portion",
+    "kg": "kg", "kgs": "kg", "kilo": "kg", "kilos": "kg",
+    "kilogram": "kg", "kilograms": "kg",
+    "g": "g", "gm": "g", "gms": "g", "gram": "g", "grams": "g",
+    "l": "litre", "ltr": "litre", "ltrs": "litre", "litre": "litre",
+    "litres": "litre", "liter": "litre", "liters": "litre",
+    "ml": "ml",
+}
+
+WORD_NUMBERS = {
+    "half": 0.5, "quarter": 0.25, "one": 1.0, "two": 2.0, "three": 3.0,
+    "four": 4.0, "five": 5.0, "ten": 10.0, "dozen": 12.0,
+}
+
+# "<number> <unit>" -- number = 1.5 / .5 / 3/4 / half ; unit optional.
+# Word poora hona chahiye: "tens" = "ten" + unit "s" nahi
+QTY_RE = re.compile(
+    r"^\s*(?:(?P<num>\d+(?:\.\d+)?|\.\d+)(?:\s*/\s*(?P<den>\d+(?:\.\d+)?))?"
+    r"|(?P<word>" + "|".join(WORD_NUMBERS) + r")\b)"
+    r"\s*(?P<unit>[a-z]+)?",
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=None)
+def unit_factors():
+    """
+    Alias -> plates factor, settings override ke saath.
+    """
+    factors = {**DEFAULT_UNIT_FACTORS, **getattr(settings, "QTY_UNIT_FACTORS", {})}
+    return {alias: factors[unit] for alias, unit in UNIT_ALIASES.items()}
+
+
+@receiver(setting_changed)
+def _reset_unit_factors(setting, **kwargs):
+    if setting == "QTY_UNIT_FACTORS":
+        unit_factors.cache_clear()
+
+
+def _factor(unit, factors):
+    # Unknown unit ("5 bowls") ko plates maana jata hai, purane behaviour jaisa
+    if not unit:
+        return 1.0
+    return factors.get(unit.lower(), 1.0)
+
+
+def parse_qty(qty):
+    """
+    Ek quantity ko plates (float) me convert karta hai.
+    Example:
+    "5 plates" -> 5.0
+    "1.5 kg"   -> 6.0
+    "half"     -> 0.5
+    Blank / samajh na aaye to 0.
+    """
+    if qty is None or qty == "":
+        return 0.0
+    if isinstance(qty, (int, float, np.number)):
+        return 0.0 if math.isnan(qty) else float(qty)
+
+    match = QTY_RE.match(str(qty))
+    if not match:
+        return 0.0
+
+    if match["word"]:
+        value = WORD_NUMBERS[match["word"].lower()]
+    else:
+        value = float(match["num"])
+        if match["den"]:
+            den = float(match["den"])
+            value = value / den if den else 0.0
+
+    return value * _factor(match["unit"], unit_factors())
+
+
+def parse_qty_batch(values):
+    """
+    Poore column ko ek saath parse karta hai.
+    `values` = list / NumPy array / pandas Series.
+    Returns (plates float64 array, invalid bool array).
+    Invalid = non-blank text jisme number nahi mila (ya "x/0").
+    """
+    series = pd.Series(values, dtype="object")
+    # Columns me values bahut repeat hoti hain: sirf unique values parse karo.
+    # None / NaN ka code -1 hai, woh neeche append kiye 0 par padta hai
+    codes, uniques = pd.factorize(series)
+    if not len(uniques):
+        return np.zeros(len(series)), np.zeros(len(series), dtype=bool)
+    uniques = pd.Series(uniques, dtype="object")
+    numeric = uniques.map(lambda v: isinstance(v, (int, float, np.number))).to_numpy(dtype=bool)
+    text = uniques.where(~numeric, "").astype(str)
+    parts = text.str.extract(QTY_RE)
+
+    num = pd.to_numeric(parts["num"], errors="coerce")
+    den = pd.to_numeric(parts["den"], errors="coerce")
+    num = num.where(den.isna(), num / den.where(den != 0))
+    words = parts["word"].str.lower().map(WORD_NUMBERS)
+    value = num.fillna(words)
+
+    factor = parts["unit"].str.lower().map(unit_factors()).fillna(1.0)
+    plates = (value * factor).to_numpy(dtype="float64", copy=True)
+    invalid = (text.str.strip() != "").to_numpy() & np.isnan(plates)
+    plates[numeric] = uniques[numeric].astype("float64")
+    plates = np.append(np.nan_to_num(plates, nan=0.0), 0.0)
+    invalid = np.append(invalid, False)
+    return plates[codes], invalid[codes]
+
+
+def format_qty(value):
+    """
+    Storage / display ke liye: 3.0 -> "3", 1.25 -> "1.25"
+    """
+    value = round(float(value), 2)
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+def format_qty_batch(values):
+    """
+    format_qty ka column version.
+    """
+    values = np.round(np.asarray(values, dtype="float64"), 2)
+    whole = values == np.floor(values)
+    return np.where(
+        whole, values.astype("int64").astype(str), values.astype(str)
+    ).tolist()
@@ -0,0 +1,112 @@
+"""
+Fixed-window rate limiter.
+
+Counter Django cache me rehta hai (saare workers share karte hain):
+cache.add + cache.incr atomic hain (Redis / Memcached / LocMem), isliye
+concurrent requests ek hi token do baar nahi le sakti. Cache backend down
+ho to process-local dict pe fallback hota hai, taaki limiter ki wajah se
+site na gire. Us dict me expire ho chuki keys LOCAL_MAX_KEYS par saaf hoti
+hain, taaki lamba cache outage memory na khaye.
+
+Rate settings me (requests, seconds) ke roop me: (5, 60) = har 60 second
+ki window me 5 requests. Window ki seema par thoda burst (2x tak) ho sakta hai.
+"""
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Fallback: key -> (value, expires_at)
+_local_buckets = {}
+_local_lock = threading.Lock()
+LOCAL_MAX_KEYS = 10000
+
+
+def _local_prune(now):
+    """
+    _local_lock ke andar. Expired keys hatao; sab zinda hon to sabse purani
+    (insertion order) -- limit thodi dheeli hogi, memory nahi badhegi.
+    """
+    if len(_local_buckets) < LOCAL_MAX_KEYS:
+        return
+    for key in [key for key, (_, expires) in _local_buckets.items() if expires <= now]:
+        del _local_buckets[key]
+    while len(_local_buckets) >= LOCAL_MAX_KEYS:
+        del _local_buckets[next(iter(_local_buckets))]
+
+
+def _window_key(key, period, now):
+    return f"ratelimit:{key}:{int(now // period)}"
+
+
+def allow(key, rate):
+    """
+    `key` ki current window me ek request ginta hai. Limit ke andar ho to True.
+    """
+    limit, period = rate
+    now = time.time()
+    cache_key = _window_key(key, period, now)
+
+    try:
+        cache.add(cache_key, 0, timeout=int(period) + 1)
+        try:
+            count = cache.incr(cache_key)
+        except ValueError:
+            # add aur incr ke beech key expire ho gayi
+            cache.add(cache_key, 1, timeout=int(period) + 1)
+            count = 1
+        return count <= limit
+    except Exception:
+        with _local_lock:
+            _local_prune(now)
+            count, expires = _local_buckets.get(cache_key, (0, (now // period + 1) * period))
+            _local_buckets[cache_key] = (count + 1, expires)
+            return count + 1 <= limit
+
+
+def client_ip(request):
+    if getattr(settings, "RATELIMIT_TRUST_X_FORWARDED_FOR", False):
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def normalize_phone(phone):
+    """
+    "+91 98765-43210" aur "9876543210" ek hi number maane jayein.
+    """
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-10:] if len(digits) > 10 else digits
+
+
+def request_food_allowed(request, phone):
+    """
+    request_food POST ke liye IP aur phone dono ke bucket check karta hai.
+    """
+    limits = settings.REQUEST_FOOD_RATE_LIMITS
+    if not allow(f"request_food:ip:{client_ip(request)}", limits["ip"]):
+        return False
+    if phone and not allow(f"request_food:phone:{phone}", limits["phone"]):
+        return False
+    return True
+
+
+def acquire_once(key, timeout):
+    """
+    Chhota sa lock: pehli baar True, timeout tak baaki sab ko False.
+    Concurrent duplicate POSTs ko ek hi row banane deta hai.
+    """
+    try:
+        return cache.add(f"once:{key}", 1, timeout)
+    except Exception:
+        now = time.time()
+        with _local_lock:
+            _local_prune(now)
+            _, expires = _local_buckets.get(f"once:{key}", (None, 0))
+            if expires > now:
+                return False
+            _local_buckets[f"once:{key}"] = (1, now + timeout)
+            return True
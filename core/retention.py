@@ -0,0 +1,226 @@
+"""
+Data retention.
+
+Horizon (settings.RETENTION_DAYS) se purani daily rows ko:
+1. WasteRollup (per restaurant + month + weekday) me fold karta hai,
+2. gzip CSV archive files me likhta hai,
+3. hot tables se delete karta hai.
+Har mahine ke liye 1-3 ek hi transaction me, isliye beech me crash ho to
+bhi koi din do baar rollup me nahi judta. Archived mahine me baad me aayi
+rows dobara fold nahi hoti (imports aise mahine reject karte hain).
+
+Isse FoodEntry / CloseDayEntry / FoodRequest aur unke indexes chhote rehte hain.
+Cutoff hamesha mahine ki pehli tareekh hota hai, taaki rollups poore mahine ke hon.
+"""
+import csv
+import gzip
+import logging
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import ExtractWeekDay
+from django.utils import timezone
+
+from .analytics import grouped_totals, month_start, python_weekday
+from .exports import EXPORTS, export_columns
+from .models import WasteRollup
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 2000
+
+ROLLUP_VALUE_FIELDS = [
+    "planned_days", "closed_days",
+    "dal_planned", "chawal_planned", "sabji_planned",
+    "dal_sold", "chawal_sold", "sabji_sold",
+    "dal_waste", "chawal_waste", "sabji_waste",
+]
+
+
+def retention_cutoff(days=None, today=None):
+    days = settings.RETENTION_DAYS if days is None else days
+    today = today or timezone.now().date()
+    return month_start(today - timedelta(days=days))
+
+
+def archive_dir():
+    path = Path(getattr(settings, "ARCHIVE_DIR", Path(settings.BASE_DIR) / "archive"))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _archive_queryset(kind, cutoff):
+    model, _, date_lookup, _ = EXPORTS[kind]
+    field = date_lookup.split("__")[0]
+    if field == "date":
+        bound = cutoff
+    else:
+        bound = timezone.make_aware(datetime.combine(cutoff, time.min))
+    return model, model.objects.filter(**{f"{field}__lt": bound})
+
+
+def _month_range(month):
+    return month, (month + timedelta(days=32)).replace(day=1)
+
+
+def _hot_months(cutoff):
+    """
+    Cutoff se pehle ke jin mahino me abhi bhi planned / closed rows hain.
+    """
+    months = set()
+    for kind in ("planned", "closed"):
+        _, qs = _archive_queryset(kind, cutoff)
+        months.update(
+            month_start(day) for day in qs.dates("date", "month")
+        )
+    return sorted(months)
+
+
+def fold_month(month):
+    """
+    Ek mahine ki hot rows rollups me. Jis (restaurant, mahina) ka rollup
+    pehle se archived hai uske rows "late" hain: unka din shayad pehle hi
+    gin liya gaya tha (rollup weekday-wise total hai, din ka pata nahi),
+    isliye dobara jodte nahi, sirf file me archive hote hain.
+    Returns (rollup rows written, late restaurants).
+    """
+    first, next_month = _month_range(month)
+    grouped = grouped_totals(
+        None, first, next_month - timedelta(days=1),
+        owner=F("user_id"), weekday=ExtractWeekDay("date"),
+    )
+    already = set(
+        WasteRollup.objects.filter(month=month, archived=True)
+        .values_list("user_id", flat=True).distinct()
+    )
+
+    rollups, late = [], set()
+    for (owner, weekday), row in grouped.items():
+        if owner in already:
+            late.add(owner)
+            continue
+        rollups.append(WasteRollup(
+            user_id=owner, month=month, day_of_week=python_weekday(weekday), archived=True,
+            **{field: row.get(field) or 0 for field in ROLLUP_VALUE_FIELDS},
+        ))
+
+    # ensure_rollups wale (non-archived) rows isi hot data se bane the; hata kar naye likho
+    folded = {rollup.user_id for rollup in rollups}
+    WasteRollup.objects.filter(month=month, archived=False, user_id__in=folded).delete()
+    WasteRollup.objects.bulk_create(rollups)
+    # Khali / zero-marker rows bhi ab archived maane jayenge
+    WasteRollup.objects.filter(month=month, archived=False).update(archived=True)
+
+    if late:
+        logger.warning(
+            "Retention: %s late row group(s) in archived month %s not folded (users %s)",
+            len(late), month, sorted(late),
+        )
+    return len(rollups), late
+
+
+class _ArchiveWriter:
+    """
+    Har kind ki ek gzip CSV file, pehli row aane par khulti hai.
+    """
+
+    def __init__(self, cutoff):
+        self.cutoff = cutoff
+        self.stamp = timezone.now().strftime("%Y%m%dT%H%M%S")
+        self.files = {}
+        self.paths = {}
+
+    def writer(self, kind):
+        if kind not in self.files:
+            path = archive_dir() / f"{kind}_before_{self.cutoff:%Y-%m-%d}_{self.stamp}.csv.gz"
+            handle = gzip.open(path, "wt", newline="")
+            writer = csv.writer(handle)
+            writer.writerow(["id"] + export_columns(kind))
+            self.files[kind], self.paths[kind] = (handle, writer), path
+        return self.files[kind][1]
+
+    def write(self, kind, qs, batch_size):
+        lookups = ["id"] + [lookup for _, lookup, _ in EXPORTS[kind][3]]
+        count = 0
+        for row in qs.order_by("id").values_list(*lookups).iterator(chunk_size=batch_size):
+            self.writer(kind).writerow(row)
+            count += 1
+        if count:
+            # Delete commit hone se pehle data disk par ho
+            self.files[kind][0].flush()
+        return count
+
+    def close(self):
+        for handle, _ in self.files.values():
+            handle.close()
+
+
+def archive_month(month, archive, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Ek transaction: mahine ka fold + file me likhna + delete. Beech me crash
+    ho to kuch commit nahi hota, agla run poora mahina dobara karta hai
+    (file me rows duplicate ho sakti hain, `id` column se pehchanein;
+    rollups me kabhi double count nahi). Rows `batch_size` id ke tukdon me
+    likhi aur delete hoti hain, poora mahina memory me nahi aata.
+    """
+    first, next_month = _month_range(month)
+    counts = {}
+    with transaction.atomic():
+        counts["rollups"], late = fold_month(month)
+        counts["late_users"] = len(late)
+        for kind in ("planned", "closed"):
+            model = EXPORTS[kind][0]
+            qs = model.objects.filter(date__gte=first, date__lt=next_month)
+            counts[kind] = 0
+            while True:
+                batch = list(qs.order_by("id").values_list("id", flat=True)[:batch_size])
+                if not batch:
+                    break
+                counts[kind] += archive.write(kind, model.objects.filter(id__in=batch), batch_size)
+                model.objects.filter(id__in=batch).delete()
+    return counts
+
+
+def archive_requests(cutoff, archive, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Food requests ka koi rollup nahi, isliye sirf file + batched delete.
+    """
+    model, qs = _archive_queryset("requests", cutoff)
+    archived = 0
+    while True:
+        batch = list(qs.order_by("id").values_list("id", flat=True)[:batch_size])
+        if not batch:
+            break
+        with transaction.atomic():
+            archived += archive.write("requests", model.objects.filter(id__in=batch), batch_size)
+            model.objects.filter(id__in=batch).delete()
+    return archived
+
+
+def pending_counts(cutoff):
+    return {kind: _archive_queryset(kind, cutoff)[1].count() for kind in EXPORTS}
+
+
+def run_retention(days=None, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Poora retention pass, mahina dar mahina (har mahina apne transaction me),
+    taaki beech me rukne par bhi rollups aur hot rows kabhi overlap na karein.
+    """
+    cutoff = retention_cutoff(days)
+    stats = {"cutoff": cutoff, "rollups": 0, "late_users": 0,
+             "planned": 0, "closed": 0, "requests": 0, "files": []}
+
+    archive = _ArchiveWriter(cutoff)
+    try:
+        for month in _hot_months(cutoff):
+            for key, value in archive_month(month, archive, batch_size).items():
+                stats[key] += value
+        stats["requests"] = archive_requests(cutoff, archive, batch_size)
+    finally:
+        archive.close()
+
+    stats["files"] = [str(path) for path in archive.paths.values()]
+    return stats
@@ -0,0 +1,233 @@
+"""
+Restaurant + surplus dish search.
+
+Har restaurant ki ek SearchDocument row (naam, area, aaj ki surplus
+dishes). Index:
+- SQLite: FTS5 table `core_search_fts`, triggers se sync (migration 0015)
+- Postgres: weighted tsvector GIN + pg_trgm index on name
+
+Rows signals se sync rehti hain: User / RestaurantProfile save par turant,
+aur aaj ki FoodEntry / CloseDayEntry save par surplus `refresh_search`
+background job me dobara nikalta hai (add_food / close_day ka request
+path halka rahe).
+"""
+import re
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils.timezone import now
+
+from .analytics import DISHES, latest_per_day
+from .models import FoodEntry, CloseDayEntry, RestaurantProfile, SearchDocument
+from .tasks import enqueue_once, task
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 50
+# bm25 weights: name, area, dishes
+FTS_WEIGHTS = (10.0, 5.0, 2.0)
+MAX_QUERY_TERMS = 8
+
+# Migration 0015 ke GIN index wala hi expression
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('simple', d.name), 'A') || "
+    "setweight(to_tsvector('simple', d.area), 'B') || "
+    "setweight(to_tsvector('simple', d.dishes), 'C')"
+)
+
+RESULT_COLUMNS = ["id", "username", "name", "area", "dishes", "surplus", "surplus_date"]
+
+
+# ================================
+# Index sync
+# ================================
+def refresh_documents(user_ids, day=None):
+    """
+    Diye gaye restaurants ki search rows ek saath upsert: naam/area profile
+    se, surplus aaj ke latest planned - sold se (home page wala rule).
+    """
+    day = day or now().date()
+    user_ids = list(user_ids)
+    if not user_ids:
+        return 0
+
+    users = User.objects.filter(id__in=user_ids).values_list("id", "username")
+    profiles = {
+        row[0]: row[1:]
+        for row in RestaurantProfile.objects.filter(user_id__in=user_ids)
+        .values_list("user_id", "display_name", "area")
+    }
+    planned = {
+        row.pop("user_id"): row
+        for row in latest_per_day(FoodEntry, users=user_ids, start=day, end=day)
+        .values("user_id", *[f"{dish}_qty" for dish in DISHES])
+    }
+    sold = {
+        row.pop("user_id"): row
+        for row in latest_per_day(CloseDayEntry, users=user_ids, start=day, end=day)
+        .values("user_id", *[f"sold_{dish}_qty" for dish in DISHES])
+    }
+
+    documents = []
+    for user_id, username in users:
+        display_name, area = profiles.get(user_id, ("", ""))
+        dishes, surplus = [], 0
+        if user_id in planned and user_id in sold:
+            for dish in DISHES:
+                left = max(planned[user_id][f"{dish}_qty"] - sold[user_id][f"sold_{dish}_qty"], 0)
+                if left:
+                    dishes.append(dish)
+                    surplus += left
+        documents.append(SearchDocument(
+            user_id=user_id,
+            username=username,
+            name=f"{display_name} {username}".strip() if display_name else username,
+            area=area,
+            dishes=" ".join(dishes),
+            surplus=surplus,
+            surplus_date=day if dishes else None,
+        ))
+
+    SearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["username", "name", "area", "dishes", "surplus", "surplus_date", "updated_at"],
+    )
+    return len(documents)
+
+
+def expire_stale_surplus(day=None):
+    """
+    Kal ka surplus aaj search me na aaye. Din me ek baar (per cache)
+    ek UPDATE; FTS trigger dishes column ke saath index bhi saaf karta hai.
+    """
+    day = day or now().date()
+    if cache.add(f"search:expired:{day.isoformat()}", 1, 60 * 60 * 24):
+        SearchDocument.objects.filter(surplus_date__lt=day).update(
+            dishes="", surplus=0, surplus_date=None
+        )
+
+
+@receiver(post_save, sender=User)
+def _user_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Login par sirf last_login badalta hai, search row ko farak nahi padta
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    refresh_documents([instance.id])
+
+
+@receiver(post_save, sender=RestaurantProfile)
+def _profile_saved(sender, instance, **kwargs):
+    refresh_documents([instance.user_id])
+
+
+@task("refresh_search")
+def refresh_search(user_id):
+    refresh_documents([user_id])
+
+
+@receiver(post_save, sender=FoodEntry)
+@receiver(post_save, sender=CloseDayEntry)
+def _entry_saved(sender, instance, **kwargs):
+    if instance.date == now().date():
+        enqueue_once("refresh_search", user_id=instance.user_id)
+
+
+# ================================
+# Query
+# ================================
+def query_terms(q):
+    return re.findall(r"\w+", (q or "").lower())[:MAX_QUERY_TERMS]
+
+
+def _fts_match(terms):
+    # Har term prefix match ("lu" -> lucknow), sab terms zaroori (AND)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _search_sqlite(terms, limit, offset):
+    sql = f"""
+        SELECT {", ".join(f"d.{c}" for c in RESULT_COLUMNS)},
+               bm25(core_search_fts, %s, %s, %s) AS rank
+        FROM core_search_fts
+        JOIN core_searchdocument d ON d.id = core_search_fts.rowid
+        WHERE core_search_fts MATCH %s
+        ORDER BY rank, d.surplus DESC
+        LIMIT %s OFFSET %s
+    """
+    params = [*FTS_WEIGHTS, _fts_match(terms), limit, offset]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(dict(zip(RESULT_COLUMNS, row)), -row[-1]) for row in cursor.fetchall()]
+
+
+def _search_postgres(terms, limit, offset):
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    text = " ".join(terms)
+    sql = f"""
+        SELECT {", ".join(f"d.{c}" for c in RESULT_COLUMNS)},
+               ts_rank({POSTGRES_VECTOR}, q) + similarity(d.name, %s) AS rank
+        FROM core_searchdocument d, to_tsquery('simple', %s) q
+        WHERE ({POSTGRES_VECTOR}) @@ q OR d.name %% %s
+        ORDER BY rank DESC, d.surplus DESC
+        LIMIT %s OFFSET %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [text, tsquery, text, limit, offset])
+        return [(dict(zip(RESULT_COLUMNS, row)), row[-1]) for row in cursor.fetchall()]
+
+
+def _browse_surplus(day, limit, offset):
+    """
+    Khali query: aaj jinke paas surplus hai, sabse zyada pehle.
+    """
+    rows = (
+        SearchDocument.objects.filter(surplus_date=day)
+        .order_by("-surplus", "id")
+        .values_list(*RESULT_COLUMNS)[offset:offset + limit]
+    )
+    return [(dict(zip(RESULT_COLUMNS, row)), None) for row in rows]
+
+
+def search(q, page=1, page_size=SEARCH_PAGE_SIZE):
+    """
+    Ranked, paginated results. Total count nahi nikalte (100k rows par
+    mehenga); ek extra row fetch karke `has_next` batate hain.
+    """
+    day = now().date()
+    expire_stale_surplus(day)
+
+    page = max(int(page), 1)
+    page_size = min(max(int(page_size), 1), SEARCH_MAX_PAGE_SIZE)
+    offset = (page - 1) * page_size
+    terms = query_terms(q)
+
+    if not terms:
+        rows = _browse_surplus(day, page_size + 1, offset)
+    elif connection.vendor == "postgresql":
+        rows = _search_postgres(terms, page_size + 1, offset)
+    else:
+        rows = _search_sqlite(terms, page_size + 1, offset)
+
+    results = []
+    for doc, rank in rows[:page_size]:
+        has_surplus = doc["surplus_date"] == day
+        results.append({
+            "username": doc["username"],
+            "name": doc["name"],
+            "area": doc["area"],
+            "dishes": doc["dishes"].split() if has_surplus else [],
+            "surplus": round(doc["surplus"], 2) if has_surplus else 0,
+            "score": round(rank, 4) if rank is not None else None,
+        })
+
+    return {
+        "query": " ".join(terms),
+        "page": page,
+        "page_size": page_size,
+        "has_next": len(rows) > page_size,
+        "results": results,
+    }
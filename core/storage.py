@@ -0,0 +1,49 @@
+"""
+Static files pipeline.
+
+`collectstatic` par ManifestStaticFilesStorage hashed filenames banata hai
+(style.3f2a1c9b8e7d.css), aur ye storage har text asset ke saath
+precompressed .gz aur .br (brotli install ho to) bhi likhta hai.
+Serve core/middleware.py ka StaticAssetMiddleware karta hai.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # .br variants optional hain
+    brotli = None
+
+COMPRESS_EXTENSIONS = (".css", ".js", ".map", ".svg", ".json", ".txt", ".html")
+# Isse chhoti files compress karne ka fayda nahi
+COMPRESS_MIN_SIZE = 512
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESS_EXTENSIONS):
+                self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as f:
+            data = f.read()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return
+
+        variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants[".br"] = brotli.compress(data, quality=11)
+
+        for suffix, compressed in variants.items():
+            # Sirf tab rakho jab sach me chhota ho
+            if len(compressed) < len(data) * 0.95:
+                with open(self.path(name + suffix), "wb") as f:
+                    f.write(compressed)
@@ -0,0 +1,208 @@
+"""
+Batch sync API (v1) for POS / offline clients.
+
+Ek request me kai din ke planned / sold entries aur request status
+changes aate hain. Poora batch ek transaction me apply hota hai:
+entries bulk import path se upsert hoti hain, status changes har status
+ke liye ek UPDATE se. Har operation ka client-generated `op_id` hota hai,
+jo dobara aaye to skip hota hai, isliye retry safe hai.
+
+Response me signed `token` aata hai; agle sync me `since` me bhejne par
+sirf us ke baad badli server-side rows (compact delta) milti hain. Delta
+at-least-once hai (overlap ki wajah se row dobara aa sakti hai) aur deletes
+report nahi hote: deleted rows ke liye client kabhi kabhi since=null se
+poora resync kare.
+"""
+from datetime import timedelta
+
+import pandas as pd
+from django.core import signing
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .analytics import latest_per_day
+from .imports import (
+    DISHES, PLANNED_COLUMNS, SOLD_COLUMNS, HistoryImportError, import_history,
+)
+from .models import FoodEntry, CloseDayEntry, FoodRequest, SyncOperation
+from .notifications import notify_status_change
+
+SYNC_VERSION = 1
+SYNC_MAX_OPERATIONS = 5000
+# Pehli baar sync (since=None) par kitne din ka data wapas bheja jaye
+SYNC_INITIAL_DAYS = 30
+# Token ka time itna peeche rakhte hain; sabse lambe write transaction se zyada ho
+SYNC_TOKEN_OVERLAP_SECONDS = 60
+TOKEN_SALT = "core.sync"
+REQUEST_STATUSES = {status for status, _ in FoodRequest.STATUS_CHOICES}
+
+
+class SyncError(ValueError):
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(errors[:5]))
+
+
+def make_token(user, moment):
+    return signing.dumps({"u": user.id, "t": moment.isoformat()}, salt=TOKEN_SALT)
+
+
+def read_token(user, token):
+    if not token:
+        return None
+    try:
+        data = signing.loads(token, salt=TOKEN_SALT)
+    except signing.BadSignature:
+        raise SyncError(["Invalid sync token"])
+    if data.get("u") != user.id:
+        raise SyncError(["Sync token belongs to another user"])
+    return parse_datetime(data["t"])
+
+
+def _is_op_id(op_id):
+    if isinstance(op_id, bool) or not isinstance(op_id, (str, int)):
+        return False
+    return 0 < len(str(op_id)) <= 64
+
+
+def _validate(payload):
+    entries = payload.get("entries") or []
+    updates = payload.get("request_updates") or []
+    errors = []
+
+    if not isinstance(entries, list) or not isinstance(updates, list):
+        raise SyncError(["'entries' and 'request_updates' must be lists"])
+    if len(entries) + len(updates) > SYNC_MAX_OPERATIONS:
+        raise SyncError([f"Too many operations (max {SYNC_MAX_OPERATIONS})"])
+
+    seen = set()
+    for i, op in enumerate(entries + updates):
+        op_id = op.get("op_id") if isinstance(op, dict) else None
+        # SyncOperation me str(op_id) store hota hai; duplicate check bhi usi par
+        if not _is_op_id(op_id):
+            errors.append(f"operation {i + 1}: missing or invalid 'op_id'")
+        elif str(op_id) in seen:
+            errors.append(f"operation {i + 1}: duplicate op_id '{op_id}'")
+        else:
+            seen.add(str(op_id))
+
+    for i, op in enumerate(updates):
+        if not isinstance(op, dict):
+            continue
+        if op.get("status") not in REQUEST_STATUSES:
+            errors.append(f"request update {i + 1}: invalid status '{op.get('status')}'")
+        request_id = op.get("id")
+        if not isinstance(request_id, int) or isinstance(request_id, bool):
+            errors.append(f"request update {i + 1}: 'id' must be an integer")
+
+    if errors:
+        raise SyncError(errors)
+    return entries, updates
+
+
+def _apply_request_updates(user, updates):
+    """
+    Status ke hisaab se group karke har group ek UPDATE.
+    Dusre restaurant ki requests chupchaap ignore hoti hain.
+    """
+    by_status = {}
+    for op in updates:
+        by_status.setdefault(op["status"], []).append(op.get("id"))
+
+    changed, now, flipped = 0, timezone.now(), []
+    for status, ids in by_status.items():
+        requests = FoodRequest.objects.filter(restaurant=user, id__in=ids)
+        flipped += [
+            FoodRequest(id=req_id, restaurant=user, requester_phone=phone, status=status)
+            for req_id, phone in requests.exclude(status=status).values_list("id", "requester_phone")
+        ]
+        changed += requests.update(status=status, updated_at=now)
+
+    # Jinka status sach me badla unke requesters ko notification (background)
+    notify_status_change(flipped)
+    return changed
+
+
+def _delta(user, since):
+    """
+    `since` ke baad badli rows; har din ki sirf latest entry.
+    """
+    if since is None:
+        start = timezone.now().date() - timedelta(days=SYNC_INITIAL_DAYS)
+        planned = latest_per_day(FoodEntry, user, start=start)
+        closed = latest_per_day(CloseDayEntry, user, start=start)
+        requests = FoodRequest.objects.filter(restaurant=user, created_at__date__gte=start)
+    else:
+        planned = latest_per_day(FoodEntry, user).filter(updated_at__gte=since)
+        closed = latest_per_day(CloseDayEntry, user).filter(updated_at__gte=since)
+        requests = FoodRequest.objects.filter(restaurant=user, updated_at__gte=since)
+
+    return {
+        "planned": [
+            {**row, "date": row["date"].isoformat()}
+            for row in planned.order_by("date").values("date", *PLANNED_COLUMNS)
+        ],
+        "closed": [
+            {**row, "date": row["date"].isoformat()}
+            for row in closed.order_by("date").values(
+                "date", *SOLD_COLUMNS, *[f"{dish}_waste" for dish in DISHES]
+            )
+        ],
+        "requests": [
+            {**row, "created_at": row["created_at"].isoformat()}
+            for row in requests.order_by("id").values(
+                "id", "requester_name", "requester_phone", "status", "created_at"
+            )
+        ],
+    }
+
+
+def sync(user, payload):
+    """
+    Poora sync: validate -> ek transaction me apply -> delta + naya token.
+    """
+    if not isinstance(payload, dict):
+        raise SyncError(["Body must be a JSON object"])
+
+    since = read_token(user, payload.get("since"))
+    entries, updates = _validate(payload)
+
+    op_ids = [str(op["op_id"]) for op in entries + updates]
+    applied = {"entries": 0, "request_updates": 0}
+
+    with transaction.atomic():
+        done = set(
+            SyncOperation.objects.filter(user=user, op_id__in=op_ids)
+            .values_list("op_id", flat=True)
+        )
+        new_entries = [op for op in entries if str(op["op_id"]) not in done]
+        new_updates = [op for op in updates if str(op["op_id"]) not in done]
+
+        if new_entries:
+            df = pd.DataFrame.from_records(new_entries).drop(columns=["op_id"])
+            try:
+                import_history(df, user=user)
+            except HistoryImportError as exc:
+                raise SyncError(exc.errors)
+            applied["entries"] = len(new_entries)
+
+        if new_updates:
+            applied["request_updates"] = _apply_request_updates(user, new_updates)
+
+        SyncOperation.objects.bulk_create(
+            [SyncOperation(user=user, op_id=str(op["op_id"])) for op in new_entries + new_updates],
+            ignore_conflicts=True,
+        )
+
+    # Watermark delta se pehle, overlap ke saath: jo transactions abhi commit
+    # nahi hue par updated_at pehle laga chuke, wo agle sync me aa jayenge.
+    # Isliye kuch rows dobara aa sakti hain; client date / id par upsert kare.
+    token_time = timezone.now() - timedelta(seconds=SYNC_TOKEN_OVERLAP_SECONDS)
+    return {
+        "version": SYNC_VERSION,
+        "token": make_token(user, token_time),
+        "applied": applied,
+        "skipped": sorted(done),
+        "delta": _delta(user, since),
+    }
@@ -0,0 +1,152 @@
+"""
+Chhota sa task queue, bina kisi external broker ke.
+
+- enqueue(name, **payload): transaction.on_commit pe Task row banata hai,
+  taaki request turant return ho aur rollback hone par job na bane.
+- enqueue_once(name, delay, **payload): same job pehle se pending ho to
+  naya nahi banta (bulk actions me ek hi job, jaise notification dispatch).
+- run_worker command: pending tasks claim karke chalata hai. Claim ek
+  conditional UPDATE hai, isliye kai worker processes saath chal sakte hain
+  (SQLite aur Postgres dono pe).
+- Fail hone par exponential backoff ke saath retry, TASK_MAX_ATTEMPTS ke baad
+  status "failed". Crash hue worker ka task lease khatam hone par wapas aata hai.
+
+Jobs @task("name") decorator se register hote hain (core/jobs.py).
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+def task(name):
+    def register(func):
+        TASKS[name] = func
+        return func
+    return register
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def enqueue(name, **payload):
+    """
+    Commit ke baad job queue karta hai. TASKS_RUN_INLINE=True ho
+    (dev / tests) to job seedha commit ke baad isi process me chal jata hai.
+    """
+    if name not in TASKS:
+        raise KeyError(f"Unknown task '{name}'")
+
+    if _setting("TASKS_RUN_INLINE", False):
+        transaction.on_commit(lambda: TASKS[name](**payload))
+    else:
+        transaction.on_commit(lambda: Task.objects.create(name=name, payload=payload))
+
+
+def enqueue_once(name, delay=0, **payload):
+    """
+    enqueue jaisa, par same name + payload ka pending task pehle se ho to
+    naya row nahi banta; zarurat ho to uska run_after pehle khisak jata hai.
+    `delay` seconds baad chalega (retry / backoff ke liye).
+    """
+    if name not in TASKS:
+        raise KeyError(f"Unknown task '{name}'")
+
+    if _setting("TASKS_RUN_INLINE", False) and not delay:
+        transaction.on_commit(lambda: TASKS[name](**payload))
+        return
+
+    def create():
+        run_after = timezone.now() + timedelta(seconds=delay)
+        pending = Task.objects.filter(name=name, payload=payload, status="pending")
+        if not pending.exists():
+            Task.objects.create(name=name, payload=payload, run_after=run_after)
+        else:
+            pending.filter(run_after__gt=run_after).update(run_after=run_after)
+
+    transaction.on_commit(create)
+
+
+def claim_next():
+    """
+    Ek runnable task claim karta hai (ya None).
+    Lease expire ho chuke "running" tasks bhi dobara uthaye jate hain.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=_setting("TASK_LEASE_SECONDS", 300))
+    runnable = Q(status="pending", run_after__lte=now) | Q(
+        status="running", locked_until__lt=now
+    )
+
+    for task_id in Task.objects.filter(runnable).order_by("run_after", "id").values_list(
+        "id", flat=True
+    )[:10]:
+        claimed = Task.objects.filter(Q(id=task_id) & runnable).update(
+            status="running",
+            locked_until=now + lease,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+        if claimed:
+            return Task.objects.get(id=task_id)
+    return None
+
+
+def run_task(job):
+    func = TASKS.get(job.name)
+    try:
+        if func is None:
+            raise KeyError(f"Unknown task '{job.name}'")
+        func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception("Task %s #%s failed", job.name, job.id)
+
+        if job.attempts >= _setting("TASK_MAX_ATTEMPTS", 5):
+            Task.objects.filter(id=job.id).update(
+                status="failed", last_error=error, locked_until=None,
+                updated_at=timezone.now(),
+            )
+        else:
+            backoff = _setting("TASK_RETRY_BASE_SECONDS", 10) * 2 ** (job.attempts - 1)
+            Task.objects.filter(id=job.id).update(
+                status="pending", last_error=error, locked_until=None,
+                run_after=timezone.now() + timedelta(seconds=backoff),
+                updated_at=timezone.now(),
+            )
+        return False
+
+    Task.objects.filter(id=job.id).update(
+        status="done", locked_until=None, updated_at=timezone.now()
+    )
+    return True
+
+
+def run_pending(limit=None):
+    """
+    Jab tak runnable tasks hain (ya limit tak) chalata hai. Count return karta hai.
+    """
+    count = 0
+    while limit is None or count < limit:
+        job = claim_next()
+        if job is None:
+            break
+        run_task(job)
+        count += 1
+    return count
+
+
+def purge_done(days=7):
+    cutoff = timezone.now() - timedelta(days=days)
+    return Task.objects.filter(status="done", updated_at__lt=cutoff).delete()[0]
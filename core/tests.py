@@ -1,3 +1,578 @@
-from django.test import TestCase
+import gzip
+import importlib
+import json
+import math
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .analytics import waste_trend
+from .models import (
+    CloseDayEntry, ErrorStat, FoodEntry, FoodRequest, PredictionRecord, SyncOperation, Task,
+    SearchDocument, WasteRollup,
+)
+from .monitoring import evaluate_day, fold_error, stddev
+from . import ratelimit
+from .quantity import parse_qty, parse_qty_batch
+from .retention import _ArchiveWriter, archive_month
+from .sync import SyncError, make_token, sync
+from .tasks import claim_next, enqueue_once, run_task, task
+
+CALLS = []
+
+
+@task("test_record")
+def _record_call(**payload):
+    CALLS.append(payload)
+
+
+@task("test_fail")
+def _always_fail(**payload):
+    raise RuntimeError("boom")
+
+
+class QuantityParsingTests(SimpleTestCase):
+    """
+    parse_qty (request path) aur parse_qty_batch (imports) ka result same ho.
+    """
+    CASES = [
+        ("5 plates", 5.0, False),
+        ("1.5 kg", 6.0, False),
+        ("2kg", 8.0, False),
+        (" .5 L", 2.0, False),
+        ("3/4 litre", 3.0, False),
+        ("half", 0.5, False),
+        ("ten plates", 10.0, False),
+        ("5 bowls", 5.0, False),       # unknown unit = plates
+        ("", 0.0, False),
+        (None, 0.0, False),
+        (float("nan"), 0.0, False),
+        (7, 7.0, False),
+        (1e20, 1e20, False),           # str() karke "1" + unit "e" nahi
+        (np.int64(4), 4.0, False),
+        ("3/0", 0.0, True),
+        ("abc", 0.0, True),
+        ("tens", 0.0, True),           # "ten" + unit "s" nahi
+    ]
+
+    def test_single_and_batch_agree(self):
+        values = [value for value, _, _ in self.CASES]
+        plates, invalid = parse_qty_batch(values)
+        for (value, expected, expected_invalid), got, got_invalid in zip(self.CASES, plates, invalid):
+            with self.subTest(value=value):
+                self.assertEqual(parse_qty(value), expected)
+                self.assertEqual(got, expected)
+                self.assertEqual(bool(got_invalid), expected_invalid)
+
+    def test_batch_repeats_and_blanks(self):
+        plates, invalid = parse_qty_batch(["2 kg", None, "2 kg", "", "x"])
+        self.assertEqual(plates.tolist(), [8.0, 0.0, 8.0, 0.0, 0.0])
+        self.assertEqual(invalid.tolist(), [False, False, False, False, True])
+
+        plates, invalid = parse_qty_batch([])
+        self.assertEqual((len(plates), len(invalid)), (0, 0))
+
+    @override_settings(QTY_UNIT_FACTORS={"kg": 5.0})
+    def test_unit_factor_override(self):
+        self.assertEqual(parse_qty("2 kg"), 10.0)
+        self.assertEqual(parse_qty_batch(["2 kg"])[0].tolist(), [10.0])
+
+    def test_backfill_migration_matches_parser(self):
+        # 0009 ki frozen copy abhi ship nahi hui; save() jaisa hi likhe
+        migration = importlib.import_module("core.migrations.0009_backfill_numeric_qty")
+        factors = {alias: migration.UNIT_FACTORS[unit] for alias, unit in migration.UNIT_ALIASES.items()}
+        for value, expected, _ in self.CASES:
+            if isinstance(value, str):
+                with self.subTest(value=value):
+                    self.assertEqual(migration.parse_plates(value, factors), expected)
+
+    def test_result_is_never_nan(self):
+        plates, _ = parse_qty_batch(["3/0", float("nan"), None])
+        self.assertFalse(any(math.isnan(value) for value in plates))
+
+
+@override_settings(TASKS_RUN_INLINE=False, TASK_MAX_ATTEMPTS=2, TASK_RETRY_BASE_SECONDS=10)
+class TaskQueueTests(TestCase):
+
+    def setUp(self):
+        CALLS.clear()
+
+    def test_claim_takes_each_due_task_once(self):
+        Task.objects.create(name="test_record", payload={"n": 1})
+        Task.objects.create(name="test_record", run_after=timezone.now() + timedelta(hours=1))
+
+        job = claim_next()
+        self.assertEqual((job.status, job.attempts), ("running", 1))
+        self.assertIsNotNone(job.locked_until)
+        # Doosra (future) task abhi due nahi, pehla already claimed
+        self.assertIsNone(claim_next())
+
+    def test_expired_lease_is_claimed_again(self):
+        job = Task.objects.create(
+            name="test_record", status="running", attempts=1,
+            locked_until=timezone.now() - timedelta(seconds=1),
+        )
+        self.assertEqual(claim_next().id, job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 2)
+
+    def test_success_marks_done(self):
+        Task.objects.create(name="test_record", payload={"n": 1})
+        self.assertTrue(run_task(claim_next()))
+        self.assertEqual(CALLS, [{"n": 1}])
+        self.assertEqual(Task.objects.get().status, "done")
+
+    def test_failure_retries_with_backoff_then_fails(self):
+        Task.objects.create(name="test_fail")
+        before = timezone.now()
+        self.assertFalse(run_task(claim_next()))
+
+        job = Task.objects.get()
+        self.assertEqual((job.status, job.attempts), ("pending", 1))
+        self.assertIsNone(job.locked_until)
+        self.assertIn("boom", job.last_error)
+        self.assertGreaterEqual(job.run_after, before + timedelta(seconds=10))
+        self.assertIsNone(claim_next())
+
+        Task.objects.update(run_after=timezone.now())
+        self.assertFalse(run_task(claim_next()))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("failed", 2))
+        self.assertIsNone(claim_next())
+
+    def test_unknown_task_fails_instead_of_crashing(self):
+        Task.objects.create(name="not_registered")
+        self.assertFalse(run_task(claim_next()))
+        self.assertIn("not_registered", Task.objects.get().last_error)
+
+    def test_enqueue_once_keeps_one_pending_row(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_once("test_record", delay=60, n=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_once("test_record", n=1)
+            enqueue_once("test_record", n=2)
+
+        self.assertEqual(Task.objects.filter(payload={"n": 1}).count(), 1)
+        self.assertEqual(Task.objects.count(), 2)
+        # Baad wala bina delay ka call pehle wale ko aage le aata hai
+        self.assertLessEqual(Task.objects.get(payload={"n": 1}).run_after, timezone.now())
+
+
+class SyncApiTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("sync_kitchen", password="x")
+        self.other = User.objects.create_user("sync_other", password="x")
+        self.request = FoodRequest.objects.create(
+            restaurant=self.user, requester_name="A", requester_phone="9876543210"
+        )
+        self.day = date(2025, 1, 6)
+
+    def _batch(self, **extra):
+        return {
+            "entries": [{"op_id": 7, "date": self.day.isoformat(), "dal": "5", "sold_dal": "3"}],
+            "request_updates": [{"op_id": "u1", "id": self.request.id, "status": "accepted"}],
+            **extra,
+        }
+
+    def _post(self, body):
+        self.client.force_login(self.user)
+        data = body if isinstance(body, str) else json.dumps(body)
+        return self.client.post("/api/v1/sync/", data, content_type="application/json")
+
+    def test_replayed_batch_is_skipped(self):
+        first = sync(self.user, self._batch())
+        self.assertEqual(first["applied"], {"entries": 1, "request_updates": 1})
+        self.request.refresh_from_db()
+        self.assertEqual(self.request.status, "accepted")
+
+        # Retry: int op_id 7 aur string "7" ek hi operation hain
+        retry = self._batch()
+        retry["entries"][0]["op_id"] = "7"
+        retry["entries"][0]["dal"] = "50"
+        second = sync(self.user, retry)
+        self.assertEqual(second["applied"], {"entries": 0, "request_updates": 0})
+        self.assertEqual(second["skipped"], ["7", "u1"])
+        entry = FoodEntry.objects.get(user=self.user, date=self.day)
+        self.assertEqual(entry.dal, "5")
+        self.assertEqual(SyncOperation.objects.filter(user=self.user).count(), 2)
+
+    def test_other_restaurants_requests_are_ignored(self):
+        theirs = FoodRequest.objects.create(
+            restaurant=self.other, requester_name="B", requester_phone="9876500000"
+        )
+        result = sync(self.user, {"request_updates": [{"op_id": 1, "id": theirs.id, "status": "rejected"}]})
+        self.assertEqual(result["applied"]["request_updates"], 0)
+        theirs.refresh_from_db()
+        self.assertEqual(theirs.status, "pending")
+
+    def test_delta_since_token(self):
+        result = sync(self.user, self._batch())
+        self.assertEqual([row["date"] for row in result["delta"]["planned"]], [])
+
+        again = sync(self.user, {"since": result["token"]})
+        # Overlap window ki wajah se abhi likhi rows dobara aati hain
+        self.assertEqual([row["date"] for row in again["delta"]["planned"]], [self.day.isoformat()])
+        self.assertEqual([row["id"] for row in again["delta"]["requests"]], [self.request.id])
+
+        with self.assertRaises(SyncError):
+            sync(self.user, {"since": make_token(self.other, timezone.now())})
+
+    def test_invalid_payloads_are_rejected_without_writes(self):
+        bad_payloads = {
+            "not an object": [],
+            "missing op_id": {"entries": [{"date": "2025-01-06", "dal": "5"}]},
+            "bool op_id": {"entries": [{"op_id": True, "date": "2025-01-06"}]},
+            "long op_id": {"entries": [{"op_id": "x" * 65, "date": "2025-01-06"}]},
+            "duplicate op_id": {"entries": [
+                {"op_id": 1, "date": "2025-01-06"}, {"op_id": "1", "date": "2025-01-07"},
+            ]},
+            "string id": {"request_updates": [{"op_id": 1, "id": str(self.request.id), "status": "accepted"}]},
+            "bool id": {"request_updates": [{"op_id": 1, "id": True, "status": "accepted"}]},
+            "bad status": {"request_updates": [{"op_id": 1, "id": self.request.id, "status": "done"}]},
+            "entries not a list": {"entries": {"op_id": 1}},
+            "bad quantity": {"entries": [{"op_id": 1, "date": "2025-01-06", "dal": "lots"}]},
+            "bad date": {"entries": [{"op_id": 1, "date": "06/01/2025", "dal": "5"}]},
+            "bad token": {"since": "garbage"},
+        }
+        for label, payload in bad_payloads.items():
+            with self.subTest(label):
+                response = self._post(payload)
+                self.assertEqual(response.status_code, 400)
+                self.assertTrue(response.json()["errors"])
+
+        self.assertEqual(self._post("{not json").status_code, 400)
+        self.assertFalse(FoodEntry.objects.exists())
+        self.assertFalse(SyncOperation.objects.exists())
+        self.request.refresh_from_db()
+        self.assertEqual(self.request.status, "pending")
+
+
+class PredictionMonitoringTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("monitor_kitchen")
+        self.day = date(2025, 2, 3)
+
+    def _predict(self, predicted, version="v1"):
+        PredictionRecord.objects.bulk_create([
+            PredictionRecord(user=self.user, date=self.day, dish=dish,
+                             predicted=predicted, model_version=version)
+            for dish in ("dal", "chawal", "sabji")
+        ])
+
+    def _close(self, sold):
+        return CloseDayEntry.objects.create(
+            user=self.user, date=self.day, sold_dal=sold, sold_chawal=sold, sold_sabji=sold
+        )
+
+    def test_fold_error_welford_and_ewma(self):
+        stat = ErrorStat(user=self.user, dish="dal")
+        for error in (2.0, 4.0, -3.0):
+            fold_error(stat, error, alpha=0.5)
+
+        self.assertEqual(stat.count, 3)
+        self.assertAlmostEqual(stat.mean, 1.0)
+        self.assertAlmostEqual(stat.m2, 26.0)
+        self.assertAlmostEqual(stddev(stat), math.sqrt(13.0))
+        # EWMA: 2 -> 3 -> 0 ; |error| EWMA: 2 -> 3 -> 3
+        self.assertAlmostEqual(stat.ewma, 0.0)
+        self.assertAlmostEqual(stat.ewma_abs, 3.0)
+        self.assertEqual(stat.last_error, -3.0)
+
+    def test_each_prediction_is_counted_once(self):
+        self._predict(10)
+        closed = self._close("6")
+        self.assertEqual(len(evaluate_day(self.user, self.day)), 3)
+
+        # close_day dobara submit / job retry: stats nahi badalte
+        closed.sold_dal = "9"
+        closed.save()
+        self.assertEqual(evaluate_day(self.user, self.day), [])
+
+        stat = ErrorStat.objects.get(user=self.user, dish="dal")
+        self.assertEqual((stat.count, stat.ewma, stat.model_version), (1, 4.0, "v1"))
+        self.assertEqual(PredictionRecord.objects.get(user=self.user, dish="dal").actual, 6.0)
+
+    def test_new_model_version_rebaselines_stats(self):
+        ErrorStat.objects.create(
+            user=self.user, dish="dal", model_version="v1",
+            count=30, mean=8.0, m2=50.0, ewma=8.0, ewma_abs=8.0, last_error=8.0,
+        )
+        self._predict(7, version="v2")
+        self._close("6")
+        evaluate_day(self.user, self.day)
+
+        stat = ErrorStat.objects.get(user=self.user, dish="dal")
+        self.assertEqual(stat.model_version, "v2")
+        self.assertEqual((stat.count, stat.mean, stat.m2, stat.ewma), (1, 1.0, 0.0, 1.0))
+
+
+class MetricsAccessTests(TestCase):
+
+    def test_default_without_token_is_staff_only(self):
+        with override_settings(METRICS_TOKEN=""):
+            self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="127.0.0.1").status_code, 403)
+
+    @override_settings(METRICS_TOKEN="", METRICS_ALLOWED_IPS=["127.0.0.1"])
+    def test_without_token_only_allowed_ips_and_staff(self):
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="127.0.0.1").status_code, 200)
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="203.0.113.9").status_code, 403)
+
+        self.client.force_login(User.objects.create_user("metrics_owner"))
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="203.0.113.9").status_code, 403)
+        self.client.force_login(User.objects.create_user("metrics_staff", is_staff=True))
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="203.0.113.9").status_code, 200)
+
+    @override_settings(METRICS_TOKEN="s3cret", METRICS_ALLOWED_IPS=["127.0.0.1"])
+    def test_token_is_required_when_set(self):
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="127.0.0.1").status_code, 401)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("foodwise_prediction_samples_total", response.content.decode())
+
+
+class RollupInvalidationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("rollup_kitchen")
+        self.month = date(2025, 3, 1)
+        for day in (4, 5, 6):
+            FoodEntry.objects.create(user=self.user, date=self.month.replace(day=day), dal="5")
+        waste_trend(self.user, "month", start=self.month)
+        self.assertTrue(self._rollups().exists())
+
+    def _rollups(self):
+        return WasteRollup.objects.filter(user=self.user, month=self.month)
+
+    def test_saving_an_old_entry_drops_its_rollup(self):
+        FoodEntry.objects.create(user=self.user, date=date(2025, 3, 7), dal="2")
+        self.assertFalse(self._rollups().exists())
+
+    def test_queryset_delete_stays_a_fast_delete(self):
+        with self.assertNumQueries(1):
+            FoodEntry.objects.filter(user=self.user).delete()
+
+    def test_admin_bulk_delete_drops_rollups_once_per_user(self):
+        entry_admin = admin.site._registry[FoodEntry]
+        queryset = FoodEntry.objects.filter(user=self.user)
+        # months nikalna + ek rollup DELETE + ek entries DELETE
+        with self.assertNumQueries(3):
+            entry_admin.delete_queryset(None, queryset)
+        self.assertFalse(self._rollups().exists())
+
+
+class RetentionTests(TestCase):
+
+    def setUp(self):
+        self.archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.archive_dir.cleanup)
+        self.user = User.objects.create_user("retention_kitchen")
+        self.month = date(2024, 1, 1)
+        # 1 Jan 2024 = Monday; 1 aur 8 dono Monday, 2 Tuesday
+        for day, planned, sold in ((1, "10", "6"), (2, "8", "8"), (8, "5", "1")):
+            when = self.month.replace(day=day)
+            FoodEntry.objects.create(user=self.user, date=when, dal=planned, chawal="0", sabji="0")
+            CloseDayEntry.objects.create(
+                user=self.user, date=when, sold_dal=sold, sold_chawal="0", sold_sabji="0",
+                dal_waste=str(int(planned) - int(sold)), chawal_waste="0", sabji_waste="0",
+            )
+        FoodEntry.objects.create(user=self.user, date=date(2024, 2, 1), dal="3")
+
+    def _archive(self):
+        with override_settings(ARCHIVE_DIR=Path(self.archive_dir.name)):
+            writer = _ArchiveWriter(self.month)
+            try:
+                counts = archive_month(self.month, writer, batch_size=2)
+            finally:
+                writer.close()
+        return counts, writer.paths
+
+    def test_fold_archive_and_delete_one_month(self):
+        counts, paths = self._archive()
+        self.assertEqual((counts["planned"], counts["closed"], counts["late_users"]), (3, 3, 0))
+
+        rollups = WasteRollup.objects.filter(user=self.user, month=self.month)
+        self.assertTrue(all(rollup.archived for rollup in rollups))
+        monday = rollups.get(day_of_week=0)
+        self.assertEqual((monday.planned_days, monday.closed_days), (2, 2))
+        self.assertEqual((monday.dal_planned, monday.dal_sold, monday.dal_waste), (15, 7, 8))
+        tuesday = rollups.get(day_of_week=1)
+        self.assertEqual((tuesday.dal_planned, tuesday.dal_sold, tuesday.dal_waste), (8, 8, 0))
+
+        # Mahina hot tables se gaya, agla mahina bacha
+        self.assertFalse(FoodEntry.objects.filter(date__lt=date(2024, 2, 1)).exists())
+        self.assertFalse(CloseDayEntry.objects.exists())
+        self.assertEqual(FoodEntry.objects.count(), 1)
+        with gzip.open(paths["planned"], "rt") as handle:
+            self.assertEqual(len(handle.readlines()), 1 + 3)
+
+        # Dobara chalane par kuch nahi badalta
+        again, _ = self._archive()
+        self.assertEqual((again["planned"], again["closed"]), (0, 0))
+        self.assertEqual(
+            WasteRollup.objects.get(user=self.user, month=self.month, day_of_week=0).dal_planned, 15
+        )
+
+
+class HistoryImportApiTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("import_kitchen")
+        self.client.force_login(self.user)
+
+    def _post_csv(self, text):
+        return self.client.post("/api/import/", text, content_type="text/csv")
+
+    def test_rows_for_other_restaurants_are_rejected(self):
+        response = self._post_csv("restaurant,date,dal,sold_dal\nA,2025-01-06,5,3\nB,2025-01-06,9,1\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(FoodEntry.objects.exists())
+        self.assertFalse(CloseDayEntry.objects.exists())
+
+    def test_own_restaurant_column_dedupes_on_date(self):
+        FoodEntry.objects.create(user=self.user, date=date(2025, 1, 6), dal="1")
+        response = self._post_csv(
+            "restaurant,date,dal,sold_dal\n"
+            "import_kitchen,2025-01-06,5,3\n"
+            ",2025-01-06,9,1\n"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["planned_updated"], 1)
+        # Last row jeetti hai, ek hi din ek hi entry
+        entry = FoodEntry.objects.get(user=self.user, date=date(2025, 1, 6))
+        self.assertEqual(entry.dal, "9")
+        self.assertEqual(CloseDayEntry.objects.filter(user=self.user).count(), 1)
+
+
+class AuthQueryTests(TestCase):
+    """
+    Shared cache par session + User cache se har authenticated page par
+    kam se kam 2 queries kam.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("auth_kitchen", password="pw")
+
+    def _dashboard_queries(self):
+        # Naya client: SessionMiddleware apna engine pehli request par pakad leta hai
+        client = self.client_class()
+        self.assertTrue(client.login(username="auth_kitchen", password="pw"))
+        client.get("/dashboard/")  # cache warm
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(client.get("/dashboard/").status_code, 200)
+        return len(queries)
+
+    def test_cached_session_and_user_save_two_queries(self):
+        with override_settings(SESSION_ENGINE="django.contrib.sessions.backends.db", USER_CACHE=False):
+            baseline = self._dashboard_queries()
+        with override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db", USER_CACHE=True):
+            cached = self._dashboard_queries()
+        self.assertLessEqual(cached, baseline - 2)
+
+    def test_per_process_cache_reads_sessions_from_db(self):
+        self.assertEqual(settings.SESSION_ENGINE, "django.contrib.sessions.backends.db")
+
+
+class ExportHistoryTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("export_kitchen")
+        self.client.force_login(self.user)
+        FoodEntry.objects.create(user=self.user, date=date(2025, 1, 6), dal="5")
+        FoodEntry.objects.create(user=self.user, date=date(2025, 2, 6), dal="7")
+
+    def test_date_range(self):
+        response = self.client.get("/export/planned/?start=2025-02-01")
+        self.assertEqual(response.status_code, 200)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1 + 1)
+
+    def test_unparseable_dates_are_rejected(self):
+        for query in ("start=garbage", "end=2025-13-40", "start=06/01/2025"):
+            with self.subTest(query):
+                self.assertEqual(self.client.get(f"/export/planned/?{query}").status_code, 400)
+        self.assertEqual(self.client.get("/api/analytics/?start=garbage").status_code, 400)
+
+
+@override_settings(REQUEST_FOOD_RATE_LIMITS={"ip": (100, 60), "phone": (3, 600)})
+class RequestFoodLimitTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.restaurant = User.objects.create_user("limit_kitchen")
+        self.url = f"/request-food/{self.restaurant.username}/"
+
+    def _post(self, phone):
+        return self.client.post(self.url, {"name": "A", "phone": phone})
+
+    def test_resubmits_redirect_without_using_the_allowance(self):
+        first = self._post("9876543210")
+        self.assertEqual(first.status_code, 302)
+        for _ in range(5):
+            self.assertRedirects(self._post("+91 98765-43210"), first.url, fetch_redirect_response=False)
+        self.assertEqual(FoodRequest.objects.count(), 1)
+
+    def test_blank_phone_is_rejected(self):
+        self.assertEqual(self._post("call me").status_code, 400)
+        self.assertFalse(FoodRequest.objects.exists())
+
+
+class LocalRateLimitFallbackTests(SimpleTestCase):
+
+    def setUp(self):
+        ratelimit._local_buckets.clear()
+        self.addCleanup(ratelimit._local_buckets.clear)
+
+    def test_fallback_counts_when_cache_is_down(self):
+        with mock.patch.object(ratelimit.cache, "add", side_effect=ConnectionError):
+            results = [ratelimit.allow("fallback", (2, 60)) for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+
+    def test_expired_keys_are_pruned(self):
+        now = 1000.0
+        for i in range(ratelimit.LOCAL_MAX_KEYS):
+            ratelimit._local_buckets[f"old:{i}"] = (1, now - 1)
+        ratelimit._local_buckets["live"] = (1, now + 60)
+        with ratelimit._local_lock:
+            ratelimit._local_prune(now)
+        self.assertEqual(list(ratelimit._local_buckets), ["live"])
+
+    def test_size_stays_bounded_when_all_keys_are_live(self):
+        now = 1000.0
+        for i in range(ratelimit.LOCAL_MAX_KEYS + 5):
+            with ratelimit._local_lock:
+                ratelimit._local_prune(now)
+                ratelimit._local_buckets[f"live:{i}"] = (1, now + 60)
+        self.assertLessEqual(len(ratelimit._local_buckets), ratelimit.LOCAL_MAX_KEYS)
+
+
+@override_settings(TASKS_RUN_INLINE=False)
+class SearchRefreshTests(TestCase):
+
+    def test_todays_entry_refreshes_search_in_the_background(self):
+        user = User.objects.create_user("search_kitchen")
+        today = timezone.now().date()
+        with self.captureOnCommitCallbacks(execute=True):
+            FoodEntry.objects.create(user=user, date=today, dal="10", chawal="0", sabji="0")
+            CloseDayEntry.objects.create(
+                user=user, date=today, sold_dal="4", sold_chawal="0", sold_sabji="0"
+            )
+        # Request path par sirf ek job, surplus abhi nahi likha
+        self.assertEqual(Task.objects.filter(name="refresh_search").count(), 1)
+        self.assertEqual(SearchDocument.objects.get(user=user).surplus, 0)
+
+        run_task(claim_next())
+        document = SearchDocument.objects.get(user=user)
+        self.assertEqual((document.dishes, document.surplus), ("dal", 6))
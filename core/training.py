@@ -0,0 +1,73 @@
+"""
+Dal / chawal / sabji models ki training (Train_model.py aur retrain job dono
+yahi use karte hain).
+
+Har (user, date) ki planned + pehli close-day entry se features; target
+agle din ka planned. Models core/ml.py ke MODEL_DIR me atomic replace se
+likhe jate hain, taaki chalte workers adhi likhi file load na karein
+(get_models mtime dekh kar khud reload kar leta hai).
+"""
+import os
+
+import pandas as pd
+from joblib import dump
+from sklearn.linear_model import LinearRegression
+
+from .analytics import DISHES
+from .ml import MODEL_DIR, feature_columns, model_path
+from .models import FoodEntry, CloseDayEntry
+from .quantity import parse_qty_batch
+
+MIN_TRAINING_ROWS = 10
+
+
+def training_frame():
+    # Collect historical data (2 queries, N+1 nahi)
+    planned = pd.DataFrame(
+        FoodEntry.objects.order_by("user", "date").values("user", "date", *DISHES)
+    )
+    closed = pd.DataFrame(
+        CloseDayEntry.objects.order_by("id").values(
+            "user", "date",
+            *[f"sold_{d}" for d in DISHES], *[f"{d}_waste" for d in DISHES],
+        )
+    )
+    if planned.empty or closed.empty:
+        return pd.DataFrame()
+
+    # Har (user, date) ki pehli close-day entry
+    closed = closed.drop_duplicates(subset=["user", "date"], keep="first")
+    merged = planned.merge(closed, on=["user", "date"], how="inner")
+
+    rows = {"day_of_week": pd.to_datetime(merged["date"]).dt.weekday}
+    for dish in DISHES:
+        added, _ = parse_qty_batch(merged[dish])
+        rows[f"{dish}_added"] = added
+        rows[f"{dish}_sold"], _ = parse_qty_batch(merged[f"sold_{dish}"])
+        rows[f"{dish}_waste"], _ = parse_qty_batch(merged[f"{dish}_waste"])
+        # targets (we'll shift later)
+        rows[f"target_{dish}"] = added
+
+    df = pd.DataFrame(rows)
+    # Shift targets to represent next day cooking (simple baseline)
+    for dish in DISHES:
+        df[f"target_{dish}"] = df[f"target_{dish}"].shift(-1)
+    return df.dropna()
+
+
+def train_models():
+    """
+    Teeno models train karke save karta hai. Returns training rows ki
+    ginti, ya 0 agar data MIN_TRAINING_ROWS se kam hai (models nahi badalte).
+    """
+    df = training_frame()
+    if len(df) < MIN_TRAINING_ROWS:
+        return 0
+
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    for dish in DISHES:
+        model = LinearRegression().fit(df[feature_columns(dish)], df[f"target_{dish}"])
+        tmp_path = model_path(dish) + ".tmp"
+        dump(model, tmp_path)
+        os.replace(tmp_path, model_path(dish))
+    return len(df)
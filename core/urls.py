@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import home, register, restaurant_dashboard,add_food,close_day,predict_page,request_food,accept_request, reject_request,request_status,delete_request,delete_all_requests
+from .views import home, register, restaurant_dashboard,add_food,close_day,predict_page,forecast_api,request_food,accept_request, reject_request,request_status,delete_request,delete_all_requests,export_history,import_history_api,analytics_page,analytics_api,sync_api_v1,ready,metrics,chain_dashboard,chain_api,chain_outlet,search_page,search_api
 from django.contrib.auth import views as auth_views
 
 
@@ -11,12 +11,25 @@ urlpatterns = [
     path('close_day/',close_day,name='close_day'),
     path("logout/", auth_views.LogoutView.as_view(next_page='home'), name="logout"),
     path("predict/", predict_page, name="predict_page"),
+    path("api/forecast/", forecast_api, name="forecast_api"),
     path("request-food/<str:restaurant_username>/", request_food, name="request_food"),
     path("request/accept/<int:req_id>/", accept_request, name="accept_request"),
     path("request/reject/<int:req_id>/", reject_request, name="reject_request"),
     path("request-status/<int:req_id>/", request_status, name="request_status"),
     path("delete-request/<int:req_id>/", delete_request, name="delete_request"),
     path("delete-all-requests/", delete_all_requests, name="delete_all_requests"),
+    path("export/<str:kind>/", export_history, name="export_history"),
+    path("api/import/", import_history_api, name="import_history_api"),
+    path("analytics/", analytics_page, name="analytics_page"),
+    path("api/analytics/", analytics_api, name="analytics_api"),
+    path("api/v1/sync/", sync_api_v1, name="sync_api_v1"),
+    path("ready/", ready, name="ready"),
+    path("metrics", metrics, name="metrics"),
+    path("chain/<int:org_id>/", chain_dashboard, name="chain_dashboard"),
+    path("chain/<int:org_id>/outlet/<str:username>/", chain_outlet, name="chain_outlet"),
+    path("api/chain/<int:org_id>/", chain_api, name="chain_api"),
+    path("search/", search_page, name="search_page"),
+    path("api/search/", search_api, name="search_api"),
 
 
 
@@ -7,105 +7,43 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import login
 from django.contrib import messages
-from django.utils.timezone import now
+from django.utils.timezone import now, localdate
 from django.contrib.auth.models import User
 from django.views.decorators.csrf import csrf_protect
+from django.http import HttpResponse, StreamingHttpResponse, HttpResponseBadRequest, Http404, JsonResponse
+from django.views.decorators.http import require_POST
+from django.utils.dateparse import parse_date
+from django.conf import settings
 
 # ================================
 # App Models
 # ================================
-from .models import FoodEntry, CloseDayEntry, FoodRequest
+from .models import FoodEntry, CloseDayEntry, FoodRequest, Organization
+from .exports import EXPORTS, ExportError, stream_export
+from .imports import HistoryImportError, import_history, read_records
+from .quantity import parse_qty, format_qty
+from .analytics import DISHES, analytics_summary
+from .helpers import build_ml_features_for_day, get_latest_entry
+from .tasks import enqueue
+from .sync import SyncError, sync
+from .ratelimit import acquire_once, normalize_phone, request_food_allowed
+from .ml import predict_next_day
+from .warmup import readiness
+from .chain import chain_summary, outlet_detail
+from .search import search
+from .forecast import restaurant_forecast
+from .notifications import notify_status_change
+from .monitoring import metrics_text
 
 # ================================
 # Python Utilities
 # ================================
-from pathlib import Path
-import csv
-import os
-
-# ================================
-# ML Model Loading
-# ================================
-from joblib import load
-from django.conf import settings
-
-# ML model paths
-DAL_MODEL_PATH = os.path.join(settings.BASE_DIR, "models", "dal_model.pkl")
-CHAWAL_MODEL_PATH = os.path.join(settings.BASE_DIR, "models", "chawal_model.pkl")
-SABJI_MODEL_PATH = os.path.join(settings.BASE_DIR, "models", "sabji_model.pkl")
-
-# Load ML models once (server start pe)
-dal_model = load(DAL_MODEL_PATH)
-chawal_model = load(CHAWAL_MODEL_PATH)
-sabji_model = load(SABJI_MODEL_PATH)
-
+import json
 
 # ================================
 # Helper Functions
 # ================================
 
-def parse_qty(qty):
-    """
-    Form se aane wali quantity ko numeric me convert karta hai.
-    Example:
-    "5 plates" -> 5
-    "10" -> 10
-    """
-    if not qty:
-        return 0
-    try:
-        return int(str(qty).split()[0])
-    except:
-        return 0
-
-
-def get_latest_entry(model, user, date):
-    """
-    Kisi user ke liye given date par agar multiple entries hain
-    to latest wali entry return karta hai.
-    """
-    return model.objects.filter(user=user, date=date).order_by('-id').first()
-
-
-def build_ml_features_for_day(user, date):
-    """
-    ML model ke liye required features database se collect karta hai.
-    """
-    planned = get_latest_entry(FoodEntry, user, date)
-    closed = get_latest_entry(CloseDayEntry, user, date)
-
-    if not planned or not closed:
-        return None
-
-    return {
-        "day_of_week": date.weekday(),
-        "dal_added": parse_qty(planned.dal),
-        "chawal_added": parse_qty(planned.chawal),
-        "sabji_added": parse_qty(planned.sabji),
-        "dal_sold": parse_qty(closed.sold_dal),
-        "chawal_sold": parse_qty(closed.sold_chawal),
-        "sabji_sold": parse_qty(closed.sold_sabji),
-        "dal_waste": closed.dal_waste,
-        "chawal_waste": closed.chawal_waste,
-        "sabji_waste": closed.sabji_waste,
-    }
-
-
-def append_ml_row_to_csv(features):
-    """
-    Har din ka ML training data CSV file me store karta hai
-    jisse future me model retrain ho sake.
-    """
-    file_path = Path("ml_data.csv")
-    file_exists = file_path.exists()
-
-    with open(file_path, "a", newline="") as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(features.keys())
-        writer.writerow(features.values())
-
-
 def calculate_remaining(planned, closed):
     """
     Donation section ke liye:
@@ -140,9 +78,9 @@ def home(request):
         if dal or chawal or sabji:
             donations.append({
                 "restaurant": planned.user.username,
-                "dal": dal,
-                "chawal": chawal,
-                "sabji": sabji,
+                "dal": format_qty(dal),
+                "chawal": format_qty(chawal),
+                "sabji": format_qty(sabji),
             })
 
     return render(request, "index.html", {"donations": donations})
@@ -188,6 +126,7 @@ def restaurant_dashboard(request):
         "planned": planned,
         "closed": closed,
         "requests": requests,
+        "chains": request.user.owned_organizations.all(),
     })
 
 
@@ -252,9 +191,9 @@ def close_day(request):
         dal_waste = chawal_waste = sabji_waste = 0
 
         if planned:
-            dal_waste = max(parse_qty(planned.dal) - parse_qty(sold_dal), 0)
-            chawal_waste = max(parse_qty(planned.chawal) - parse_qty(sold_chawal), 0)
-            sabji_waste = max(parse_qty(planned.sabji) - parse_qty(sold_sabji), 0)
+            dal_waste = format_qty(max(parse_qty(planned.dal) - parse_qty(sold_dal), 0))
+            chawal_waste = format_qty(max(parse_qty(planned.chawal) - parse_qty(sold_chawal), 0))
+            sabji_waste = format_qty(max(parse_qty(planned.sabji) - parse_qty(sold_sabji), 0))
 
         if closed:
             closed.sold_dal = sold_dal
@@ -276,9 +215,10 @@ def close_day(request):
                 date=today
             )
 
-        features = build_ml_features_for_day(request.user, today)
-        if features:
-            append_ml_row_to_csv(features)
+        # ML row CSV likhna background worker karega (core/jobs.py)
+        enqueue("record_ml_row", user_id=request.user.id, date=today.isoformat())
+        # Prediction error stats + kal ki prediction (core/monitoring.py)
+        enqueue("track_predictions", user_id=request.user.id, date=today.isoformat())
 
         messages.success(request, "Day closed successfully ✅")
         return redirect("restaurant_dashboard")
@@ -300,45 +240,15 @@ def predict_page(request):
     dal_pred = chawal_pred = sabji_pred = None
 
     if request.method == "POST":
-        today = now().date()
-        planned = get_latest_entry(FoodEntry, request.user, today)
-        closed = get_latest_entry(CloseDayEntry, request.user, today)
-
-        if planned and closed:
-            # ✅ Day of week (0 = Monday, 6 = Sunday)
-            day_of_week = int(today.weekday())
-
-            # ✅ Safe numeric conversion (string -> int)
-            dal_added = int(parse_qty(planned.dal))
-            chawal_added = int(parse_qty(planned.chawal))
-            sabji_added = int(parse_qty(planned.sabji))
-
-            dal_sold = int(parse_qty(closed.sold_dal))
-            chawal_sold = int(parse_qty(closed.sold_chawal))
-            sabji_sold = int(parse_qty(closed.sold_sabji))
-
-            dal_waste = int(closed.dal_waste or 0)
-            chawal_waste = int(closed.chawal_waste or 0)
-            sabji_waste = int(closed.sabji_waste or 0)
-
-            # ✅ Final ML input (pure numbers only)
-            dal_input = [[day_of_week, dal_added, dal_sold, dal_waste]]
-            chawal_input = [[day_of_week, chawal_added, chawal_sold, chawal_waste]]
-            sabji_input = [[day_of_week, sabji_added, sabji_sold, sabji_waste]]
-
-            # 🔮 ML Predictions
-            dal_pred = round(float(dal_model.predict(dal_input)[0]))
-            chawal_pred = round(float(chawal_model.predict(chawal_input)[0]))
-            sabji_pred = round(float(sabji_model.predict(sabji_input)[0]))
+        # Planned + closed dono ho tabhi features milte hain
+        features = build_ml_features_for_day(request.user, now().date())
 
-            # ✅ Business logic: kam se kam aaj ke sold se thoda zyada cook karo
-            dal_baseline = int(dal_sold * 1.1)
-            chawal_baseline = int(chawal_sold * 1.1)
-            sabji_baseline = int(sabji_sold * 1.1)
-
-            dal_pred = max(1, dal_pred, dal_baseline)
-            chawal_pred = max(1, chawal_pred, chawal_baseline)
-            sabji_pred = max(1, sabji_pred, sabji_baseline)
+        if features:
+            # 🔮 ML Predictions (+ kam se kam aaj ke sold se thoda zyada)
+            prediction = predict_next_day([features])[0]
+            dal_pred = prediction["dal"]
+            chawal_pred = prediction["chawal"]
+            sabji_pred = prediction["sabji"]
 
     return render(request, 'predict.html', {
         "dal_pred": dal_pred,
@@ -346,6 +256,18 @@ def predict_page(request):
         "sabji_pred": sabji_pred,
     })
 
+@never_cache
+@login_required
+def forecast_api(request):
+    """
+    Agle 1-14 din ka forecast, last closed din se. ?days=7 (default)
+    """
+    try:
+        days = int(request.GET.get("days", 7))
+    except ValueError:
+        return JsonResponse({"errors": ["days must be a number"]}, status=400)
+    return JsonResponse(restaurant_forecast(request.user, days))
+
 # ================================
 # Food Request System
 # ================================
@@ -358,7 +280,30 @@ def request_food(request, restaurant_username):
 
     if request.method == "POST":
         name = request.POST.get("name")
-        phone = request.POST.get("phone")
+        phone = normalize_phone(request.POST.get("phone"))
+
+        # Khali phone par dedupe / phone limit kaam nahi karte, isliye zaroori
+        if not phone:
+            messages.error(request, "Please enter a valid phone number.")
+            return render(request, "Request_Food.html", {"restaurant": restaurant}, status=400)
+
+        # Same phone + same restaurant + same din = ek hi request. Aisa dobara
+        # POST sirf redirect hai, rate limit me nahi ginta
+        existing = find_duplicate_request(restaurant, phone)
+        if existing is None:
+            if not request_food_allowed(request, phone):
+                messages.error(request, "Too many requests. Please try again in a few minutes.")
+                return render(request, "Request_Food.html", {"restaurant": restaurant}, status=429)
+            if acquire_once(f"request_food:{restaurant.id}:{phone}", settings.REQUEST_FOOD_DEDUPE_LOCK_SECONDS):
+                existing = find_duplicate_request(restaurant, phone)
+            else:
+                # Dusra POST abhi yahi row bana raha hai
+                messages.info(request, "Your request is already being sent.")
+                return render(request, "Request_Food.html", {"restaurant": restaurant}, status=409)
+
+        if existing is not None:
+            messages.info(request, "You have already requested food from this restaurant today.")
+            return redirect("request_status", req_id=existing.id)
 
         req = FoodRequest.objects.create(
             restaurant=restaurant,
@@ -370,7 +315,16 @@ def request_food(request, restaurant_username):
         messages.success(request, "Your request has been sent.")
         return redirect("request_status", req_id=req.id)
 
-    return render(request, "request_food.html", {"restaurant": restaurant})
+    return render(request, "Request_Food.html", {"restaurant": restaurant})
+
+
+def find_duplicate_request(restaurant, phone):
+    return (
+        FoodRequest.objects.filter(
+            restaurant=restaurant, requester_phone=phone, created_at__date=localdate()
+        )
+        .order_by("id").first()
+    )
 
 
 def request_status(request, req_id):
@@ -384,16 +338,26 @@ def request_status(request, req_id):
 @login_required
 def accept_request(request, req_id):
     req = get_object_or_404(FoodRequest, id=req_id, restaurant=request.user)
+    changed = req.status != "accepted"
     req.status = "accepted"
     req.save()
+    if changed:
+        # Requester ko SMS / webhook; bhejna background worker karega
+        req.restaurant = request.user
+        notify_status_change([req])
     return redirect("restaurant_dashboard")
 
 
 @login_required
 def reject_request(request, req_id):
     req = get_object_or_404(FoodRequest, id=req_id, restaurant=request.user)
+    changed = req.status != "rejected"
     req.status = "rejected"
     req.save()
+    if changed:
+        # Requester ko SMS / webhook; bhejna background worker karega
+        req.restaurant = request.user
+        notify_status_change([req])
     return redirect("restaurant_dashboard")
 
 
@@ -411,3 +375,237 @@ def delete_all_requests(request):
     FoodRequest.objects.filter(restaurant=request.user).delete()
     messages.success(request, "All food requests deleted successfully 🗑️")
     return redirect("restaurant_dashboard")
+
+
+# ================================
+# History Export
+# ================================
+def _query_date(request, name):
+    """
+    ?name=YYYY-MM-DD; khali ho to None. Galat date par ValueError, taaki
+    ?start=garbage chupchaap poori history na de de.
+    """
+    value = request.GET.get(name, "")
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f"Invalid {name} date '{value}', expected YYYY-MM-DD")
+    return parsed
+
+
+@never_cache
+@login_required
+def export_history(request, kind):
+    """
+    Owner apni history CSV / Parquet me download karta hai.
+    ?start=YYYY-MM-DD&end=YYYY-MM-DD&format=csv|parquet
+    Response stream hota hai, poori file RAM me nahi banti.
+    """
+    if kind not in EXPORTS:
+        raise Http404("Unknown export")
+
+    fmt = request.GET.get("format", "csv")
+
+    try:
+        start = _query_date(request, "start")
+        end = _query_date(request, "end")
+        chunks = stream_export(kind, fmt, start=start, end=end, user=request.user)
+    except (ExportError, ValueError) as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    content_type = "application/vnd.apache.parquet" if fmt == "parquet" else "text/csv"
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response["Content-Disposition"] = (
+        f'attachment; filename="{request.user.username}_{kind}.{fmt}"'
+    )
+    return response
+
+
+# ================================
+# Bulk History Import (API)
+# ================================
+@login_required
+@require_POST
+def import_history_api(request):
+    """
+    Purana data ek saath upload karne ke liye.
+    Body: JSON rows ya CSV (raw body ya `file` upload).
+    Columns: date, dal, chawal, sabji, sold_dal, sold_chawal, sold_sabji
+    """
+    upload = request.FILES.get("file")
+    if upload is not None:
+        data = upload.read()
+        fmt = "json" if upload.name.lower().endswith(".json") else "csv"
+    else:
+        data = request.body
+        fmt = "json" if request.content_type == "application/json" else "csv"
+
+    try:
+        df = read_records(data, fmt)
+        stats = import_history(df, user=request.user)
+    except HistoryImportError as exc:
+        return JsonResponse({"errors": exc.errors}, status=400)
+    except ValueError as exc:
+        return JsonResponse({"errors": [str(exc)]}, status=400)
+
+    return JsonResponse(stats)
+
+
+# ================================
+# Waste Analytics
+# ================================
+def _analytics_params(request):
+    period = request.GET.get("period", "week")
+    return period, _query_date(request, "start"), _query_date(request, "end")
+
+
+@never_cache
+@login_required
+def analytics_page(request):
+    """
+    Weekly / monthly waste trend aur weekday pattern
+    """
+    try:
+        summary = analytics_summary(request.user, *_analytics_params(request))
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    return render(request, "analytics.html", {**summary, "dishes": DISHES})
+
+
+@never_cache
+@login_required
+def analytics_api(request):
+    """
+    Same analytics JSON me, charts ke liye.
+    ?period=week|month&start=YYYY-MM-DD&end=YYYY-MM-DD
+    """
+    try:
+        summary = analytics_summary(request.user, *_analytics_params(request))
+    except ValueError as exc:
+        return JsonResponse({"errors": [str(exc)]}, status=400)
+
+    return JsonResponse(summary)
+
+
+# ================================
+# Chain (Multi-outlet) Dashboard
+# ================================
+@never_cache
+@login_required
+def chain_dashboard(request, org_id):
+    """
+    Chain owner ke liye saare outlets ka aaj ka haal + kal ka forecast
+    """
+    org = get_object_or_404(Organization, id=org_id, owner=request.user)
+    return render(request, "chain_dashboard.html", {**chain_summary(org), "dishes": DISHES})
+
+
+@never_cache
+@login_required
+def chain_api(request, org_id):
+    """
+    Same chain dashboard JSON me
+    """
+    org = get_object_or_404(Organization, id=org_id, owner=request.user)
+    return JsonResponse(chain_summary(org))
+
+
+@never_cache
+@login_required
+def chain_outlet(request, org_id, username):
+    """
+    Chain dashboard se ek outlet ka drill-down
+    """
+    org = get_object_or_404(Organization, id=org_id, owner=request.user)
+    outlet = get_object_or_404(org.outlets, username=username)
+    return render(request, "chain_outlet.html", {
+        "org": org,
+        "outlet": outlet_detail(org, outlet),
+        "dishes": DISHES,
+    })
+
+
+# ================================
+# Search
+# ================================
+def _search_params(request):
+    try:
+        page = int(request.GET.get("page", 1))
+    except ValueError:
+        page = 1
+    return request.GET.get("q", ""), page
+
+
+def search_page(request):
+    """
+    Restaurant naam, area ya surplus dish se dhoondo (public)
+    """
+    q, page = _search_params(request)
+    return render(request, "search.html", search(q, page))
+
+
+def search_api(request):
+    """
+    Same search JSON me. ?q=...&page=N
+    """
+    q, page = _search_params(request)
+    return JsonResponse(search(q, page))
+
+
+# ================================
+# Batch Sync API (POS / offline)
+# ================================
+@login_required
+@require_POST
+def sync_api_v1(request):
+    """
+    Offline kitchen ka poora batch ek request me.
+    Body: {"since": token, "entries": [...], "request_updates": [...]}
+    Details core/sync.py me.
+    """
+    try:
+        payload = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"errors": ["Invalid JSON"]}, status=400)
+
+    try:
+        return JsonResponse(sync(request.user, payload))
+    except SyncError as exc:
+        return JsonResponse({"errors": exc.errors}, status=400)
+
+
+# ================================
+# Health / Readiness
+# ================================
+@never_cache
+def ready(request):
+    """
+    Load balancer / deploy script ke liye: worker warm hai ya nahi.
+    """
+    ok, details = readiness()
+    return JsonResponse(details, status=200 if ok else 503)
+
+
+@never_cache
+def metrics(request):
+    """
+    Prometheus scrape endpoint: prediction error / drift stats.
+    METRICS_TOKEN set ho to "Authorization: Bearer <token>" zaroori; warna
+    sirf logged-in staff ya METRICS_ALLOWED_IPS (restaurant names leak na
+    hon). IP seedha REMOTE_ADDR se, X-Forwarded-For client bana sakta hai.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        if request.headers.get("Authorization") != f"Bearer {token}":
+            return HttpResponse(status=401)
+    elif not (
+        request.user.is_staff
+        or request.META.get("REMOTE_ADDR") in getattr(settings, "METRICS_ALLOWED_IPS", ())
+    ):
+        return HttpResponse(status=403)
+    return HttpResponse(metrics_text(), content_type="text/plain; version=0.0.4")
@@ -0,0 +1,107 @@
+"""
+Server startup.
+
+preload(): master process me, fork se pehle (gunicorn preload_app).
+    Templates compile, ML models load, quantity tables ready. Ye sab
+    workers copy-on-write share karte hain.
+warmup(): har worker me fork ke baad, traffic lene se pehle.
+    Apna DB connection, cache connection aur ek dummy prediction
+    (sklearn / BLAS ka lazy init fork ke baad hi hona chahiye).
+
+/ready/ tab tak 503 deta hai jab tak warmup poora na ho.
+"""
+import gc
+import os
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+from django.template.loader import get_template
+
+from .ml import get_models
+from .quantity import parse_qty
+
+_state = {"ready": False, "warmup_ms": None, "started": time.time()}
+
+
+def template_names():
+    names = []
+    for engine in settings.TEMPLATES:
+        for directory in engine.get("DIRS", []):
+            root = Path(directory)
+            names += [str(p.relative_to(root)) for p in root.rglob("*.html")]
+    return sorted(names)
+
+
+def preload():
+    """
+    Master process me ek baar. DB connection yahan khula na rahe,
+    warna saare workers ek hi socket share karenge.
+    """
+    for name in template_names():
+        get_template(name)
+    get_models()
+    parse_qty("1 kg")
+
+    connections.close_all()
+    # Ab tak bane objects ko GC scan se bahar rakho, taaki workers me
+    # refcount/GC writes shared pages ko copy na karwayein
+    gc.freeze()
+
+
+def warmup():
+    """
+    Har worker me, requests lene se pehle.
+    """
+    started = time.perf_counter()
+
+    connection.ensure_connection()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+    cache.get("warmup")
+
+    with warnings.catch_warnings():
+        # Models DataFrame pe train hue hain; dummy input ke feature names nahi hote
+        warnings.simplefilter("ignore", UserWarning)
+        for model in get_models().values():
+            model.predict(np.zeros((1, model.n_features_in_)))
+
+    _state["warmup_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    _state["ready"] = True
+
+
+def process_rss_kb():
+    try:
+        with open(f"/proc/{os.getpid()}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def readiness():
+    """
+    (ready?, details). runserver me warmup kabhi nahi chalta, wahan
+    pehli readiness check hi warmup kar deti hai.
+    """
+    if not _state["ready"]:
+        try:
+            warmup()
+        except Exception as exc:
+            return False, {"ready": False, "error": str(exc)}
+
+    return True, {
+        "ready": True,
+        "pid": os.getpid(),
+        "warmup_ms": _state["warmup_ms"],
+        "uptime_s": round(time.time() - _state["started"], 1),
+        "rss_kb": process_rss_kb(),
+    }
@@ -0,0 +1,128 @@
+"""
+Production launcher ka cold start aur per-worker memory naapta hai.
+
+    python measure_startup.py --workers 4
+    python measure_startup.py --workers 4 --no-preload   # comparison ke liye
+
+Gunicorn ko Waste_Food_System/gunicorn.conf.py ke saath start karta hai,
+/ready/ 200 aane tak ka time (cold start) aur har worker ka RSS / PSS / USS
+print karta hai. PSS aur USS Linux ke /proc/<pid>/smaps_rollup se aate hain:
+preload ke saath shared pages PSS me baant diye jate hain, isliye USS
+(sirf worker ki apni memory) chhota hona chahiye.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Waste_Food_System", "gunicorn.conf.py")
+
+
+def get_json(url, timeout=2):
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            return resp.status, json.loads(resp.read() or b"{}")
+    except urllib.error.HTTPError as exc:
+        return exc.code, {}
+    except (urllib.error.URLError, ConnectionError, OSError):
+        return None, {}
+
+
+def children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+def memory_kb(pid):
+    """
+    {rss, pss, uss} kB me (Linux only).
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":"):
+                    fields[parts[0][:-1]] = int(parts[1])
+    except OSError:
+        return None
+    return {
+        "rss": fields.get("Rss"),
+        "pss": fields.get("Pss"),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--no-preload", action="store_true", help="preload_app band karke chalao")
+    args = parser.parse_args()
+
+    env = {
+        **os.environ,
+        "PORT": str(args.port),
+        "WEB_CONCURRENCY": str(args.workers),
+        "GUNICORN_PRELOAD": "0" if args.no_preload else "1",
+    }
+    cmd = [sys.executable, "-m", "gunicorn", "-c", CONFIG, "--access-logfile", "/dev/null"]
+
+    ready_url = f"http://127.0.0.1:{args.port}/ready/"
+    started = time.perf_counter()
+    server = subprocess.Popen(cmd, env=env)
+
+    try:
+        cold_start = None
+        pids = {}
+        deadline = started + args.timeout
+        while time.perf_counter() < deadline and len(pids) < args.workers:
+            if server.poll() is not None:
+                sys.exit(f"gunicorn exited with code {server.returncode}")
+            status, body = get_json(ready_url)
+            if status == 200:
+                if cold_start is None:
+                    cold_start = time.perf_counter() - started
+                pids[body["pid"]] = body
+            else:
+                time.sleep(0.05)
+
+        if cold_start is None:
+            sys.exit(f"/ready/ did not return 200 within {args.timeout}s")
+
+        all_ready = time.perf_counter() - started
+        print(f"preload:             {'off' if args.no_preload else 'on'}")
+        print(f"first ready:         {cold_start * 1000:.0f} ms")
+        print(f"workers seen ready:  {len(pids)}/{args.workers} after {all_ready * 1000:.0f} ms")
+        print()
+
+        print(f"{'process':<16}{'RSS MB':>10}{'PSS MB':>10}{'USS MB':>10}{'warmup ms':>12}")
+        total_pss = total_uss = 0
+        for pid in [server.pid] + children(server.pid):
+            mem = memory_kb(pid)
+            if mem is None:
+                continue
+            label = "master" if pid == server.pid else f"worker {pid}"
+            warm = pids.get(pid, {}).get("warmup_ms")
+            total_pss += mem["pss"] or 0
+            total_uss += mem["uss"] or 0
+            print(
+                f"{label:<16}{mem['rss'] / 1024:>10.1f}{(mem['pss'] or 0) / 1024:>10.1f}"
+                f"{mem['uss'] / 1024:>10.1f}{warm if warm is not None else '-':>12}"
+            )
+        print(f"{'total':<16}{'':>10}{total_pss / 1024:>10.1f}{total_uss / 1024:>10.1f}")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()